@@ -0,0 +1,72 @@
+"""
+Memory and latency comparison between the raw dsa.json dicts, CompactDSAStore
+and the memory-mapped MappedDSAStore (dsa_binary.py).
+
+    python benchmarks/bench_dsa_store.py [path/to/dsa.json]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dsa_store import CompactDSAStore
+from dsa_binary import MappedDSAStore, write_binary
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def time_per_call(fn, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(path):
+    with open(path, "r") as file:
+        text = file.read()
+
+    raw, raw_bytes = measure_memory(lambda: json.loads(text))
+    store, store_bytes = measure_memory(lambda: CompactDSAStore.from_raw(json.loads(text)))
+    binary_path = os.path.join(tempfile.mkdtemp(prefix="dsa_binary_"), "dsa.bin")
+    write_binary(store, binary_path)
+    mapped, mapped_bytes = measure_memory(lambda: MappedDSAStore.open(binary_path))
+
+    total = sum(len(v) for v in raw.values())
+    print(f"companies: {len(raw)}  entries: {total}  unique questions: {len(store.questions)}")
+    print(f"raw dicts memory:     {raw_bytes / 1e6:8.2f} MB")
+    print(f"compact store memory: {store_bytes / 1e6:8.2f} MB")
+    print(f"mapped store memory:  {mapped_bytes / 1e6:8.2f} MB private "
+          f"+ {os.path.getsize(binary_path) / 1e6:.2f} MB shared mapping")
+
+    print(f"parse raw:            {time_per_call(lambda: json.loads(text), 5) * 1e3:8.2f} ms")
+    print(f"build compact store:  {time_per_call(lambda: CompactDSAStore.from_raw(json.loads(text)), 5) * 1e3:8.2f} ms")
+    print(f"open mapped store:    {time_per_call(lambda: MappedDSAStore.open(binary_path), 20) * 1e3:8.2f} ms")
+
+    company = max(raw, key=lambda c: len(raw[c]))
+    raw_t = time_per_call(lambda: json.dumps({company: raw[company]}))
+    store_t = time_per_call(
+        lambda: json.dumps({company: [q.to_dict() for q in store.company_questions(company)]})
+    )
+    print(f"lookup+serialize '{company}' ({len(raw[company])} questions):")
+    print(f"  raw dicts:          {raw_t * 1e3:8.3f} ms")
+    mapped_t = time_per_call(
+        lambda: json.dumps({company: [q.to_dict() for q in mapped.company_questions(company)]})
+    )
+    print(f"  compact store:      {store_t * 1e3:8.3f} ms")
+    print(f"  mapped store:       {mapped_t * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    default = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dsa.json")
+    main(sys.argv[1] if len(sys.argv) > 1 else default)
@@ -0,0 +1,92 @@
+"""
+Compare the extractor backends against the original full html.parser tree.
+
+Uses the pages in benchmarks/fixtures/*.html, each evaluated with the
+extraction rule of the source it is named after (see fixtures/README.md;
+refresh them with `python ingest.py --save-html benchmarks/fixtures`). Without
+fixtures a synthetic long article page is generated.
+
+    python benchmarks/bench_extractors.py [fixtures_dir]
+"""
+import os
+import sys
+import glob
+import time
+from typing import Dict, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from extractors import BACKENDS, DEFAULT_RULE, ExtractionRule, rule_for
+from fetcher import SOURCE_URLS
+from ingest import fixture_name
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def synthetic_page(sections: int = 400) -> str:
+    nav = "".join(f"<li><a href='/x/{i}'>Link {i}</a></li>" for i in range(300))
+    body = "".join(
+        f"<h2>Question {i}: how would you design component {i}?</h2>"
+        f"<p>{'Some explanatory text with <b>markup</b> and <code>code</code>. ' * 20}</p>"
+        f"<ul>{''.join(f'<li>point {j}</li>' for j in range(10))}</ul>"
+        for i in range(sections)
+    )
+    return f"<html><head><title>t</title></head><body><nav><ul>{nav}</ul></nav><article>{body}</article><footer><h2>Footer</h2></footer></body></html>"
+
+
+def load_fixtures(fixtures_dir: str) -> Dict[str, Tuple[str, ExtractionRule]]:
+    """file name -> (html, rule of the source it was saved from); a synthetic page if there are none."""
+    rules = {fixture_name(url): rule_for(url) for url in SOURCE_URLS}
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        name = os.path.basename(path)
+        with open(path, encoding="utf-8", errors="replace") as file:
+            pages[name] = (file.read(), rules.get(name, DEFAULT_RULE))
+    if not pages:
+        print(f"No fixtures in {fixtures_dir}, using a synthetic page")
+        pages = {"synthetic.html": (synthetic_page(), DEFAULT_RULE)}
+    return pages
+
+
+def original(html: str):
+    soup = BeautifulSoup(html, 'html.parser')
+    return [h.get_text().strip() for h in soup.find_all('h2')]
+
+
+def best_of(fn, html, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(fixtures_dir):
+    pages = load_fixtures(fixtures_dir)
+    totals = dict.fromkeys(["original (full html.parser tree)", *BACKENDS], 0.0)
+    for page, (html, rule) in pages.items():
+        print(f"{page} ({len(html) / 1024:.0f} KB, questions {rule.questions!r} in {rule.region!r})")
+        contenders = {"original (full html.parser tree)": original}
+        contenders.update({name: (lambda html, fn=fn: fn(html, rule)) for name, fn in BACKENDS.items()})
+        expected = None
+        for name, fn in contenders.items():
+            elapsed, questions = best_of(fn, html)
+            totals[name] += elapsed
+            if name in BACKENDS:
+                # The backends must agree on the rule's headings; the original collected every h2
+                expected = expected if expected is not None else questions
+                note = "" if questions == expected else f" (differs from {next(iter(BACKENDS))})"
+            else:
+                note = " (every h2, no rule)"
+            print(f"  {name:34s} {elapsed * 1e3:8.2f} ms  {len(questions)} headings{note}")
+    baseline = totals["original (full html.parser tree)"]
+    print("total:")
+    for name, total in totals.items():
+        print(f"  {name:34s} {total * 1e3:8.2f} ms  {baseline / total:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else FIXTURES_DIR)
@@ -0,0 +1,62 @@
+"""
+Per-request overhead of building and compiling the LangGraph workflow on every
+call versus reusing the graph compiled once on first use (get_interview_graph).
+
+The fetcher reads a small local corpus, so only graph overhead is measured.
+
+    python benchmarks/bench_graph_compile.py
+"""
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import web_agent
+from question_corpus import QuestionCorpus, write_version
+from web_agent import InterviewState, build_interview_graph, get_interview_graph
+
+
+async def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        await fn()
+    return (time.perf_counter() - start) / n
+
+
+async def main(n=200):
+    corpus_dir = tempfile.mkdtemp()
+    write_version(corpus_dir, [{"question": f"Question {i}?", "link": "https://example.com", "type": "HR"}
+                               for i in range(50)], {})
+    corpus = QuestionCorpus(corpus_dir, check_interval=3600)
+    web_agent.get_corpus = lambda: corpus
+    state = InterviewState(input={"company_name": "Google", "job_role": "SWE", "job_description": "x"})
+
+    async def compile_per_call():
+        await build_interview_graph().ainvoke(state)
+
+    async def compiled_once():
+        await get_interview_graph().ainvoke(state)
+
+    # Silence the node progress prints while timing
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        await compiled_once()
+        start = time.perf_counter()
+        for _ in range(n):
+            build_interview_graph()
+        compile_only = (time.perf_counter() - start) / n
+        per_call = await timed(compile_per_call, n)
+        once = await timed(compiled_once, n)
+    finally:
+        sys.stdout = stdout
+    print(f"build_interview_graph():      {compile_only * 1e3:7.3f} ms")
+    print(f"compile + ainvoke per call:   {per_call * 1e3:7.3f} ms")
+    print(f"ainvoke on compiled graph:    {once * 1e3:7.3f} ms")
+    print(f"overhead removed per request: {(per_call - once) * 1e3:7.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Validation step (check_output_and_answer) against the local fake Groq server:
+concurrent requests, each split into parallel chunks, with a share of calls
+rate limited. Prints per-request latency percentiles and the LLM client stats.
+
+    python benchmarks/bench_llm.py --requests 50 --latency 0.2 --rate-limit 0.1
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import start_fake_groq
+
+
+TOPICS = ["a URL shortener", "a rate limiter", "a news feed", "a chat service", "a web crawler",
+          "a payment ledger", "a ride matching system", "a video transcoder", "an autocomplete service",
+          "a leaderboard", "a notification fanout", "a distributed cache", "a photo storage backend",
+          "a search indexer", "a metrics pipeline", "a ticket booking flow", "a collaborative editor",
+          "a feature flag store", "an inventory tracker", "a job scheduler"]
+TEMPLATES = ["Design {}.", "How does {} scale past one region?", "What breaks first in {} under load?",
+             "Which data model suits {}?"]
+
+
+def distinct_questions(n):
+    """n questions that survive deduplication: varied topics and phrasings, not one changing number."""
+    combos = [template.format(topic) for template in TEMPLATES for topic in TOPICS]
+    return [combos[i % len(combos)] + ("" if i < len(combos) else f" (variant {i // len(combos)})")
+            for i in range(n)]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def main(requests, questions, latency, rate_limit):
+    server = start_fake_groq(latency=latency, rate_limit=rate_limit)
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("GROQ_API_KEY", "test")
+
+    import llm
+    from web_agent import check_output_and_answer
+
+    scraped = [{"question": text, "link": "https://example.com", "type": "System Design"}
+               for text in distinct_questions(questions)]
+
+    async def one():
+        start = time.perf_counter()
+        await check_output_and_answer(scraped, "Backend Engineer", "Google", "Distributed systems")
+        return time.perf_counter() - start
+
+    # Silence the per-request progress prints while timing
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(requests)))
+        wall = time.perf_counter() - start
+    finally:
+        sys.stdout = stdout
+
+    stats = llm.stats.snapshot()
+    print(f"{requests} requests x {questions} questions, fake latency {latency}s, 429 rate {rate_limit:.0%}")
+    print(f"wall time:            {wall:7.3f} s")
+    print(f"request p50/p95/p99:  {percentile(latencies, 0.5):.3f} / {percentile(latencies, 0.95):.3f} / "
+          f"{percentile(latencies, 0.99):.3f} s")
+    print(f"LLM call p50/p95/p99: {stats.get('latency_p50', 0):.3f} / {stats.get('latency_p95', 0):.3f} / "
+          f"{stats.get('latency_p99', 0):.3f} s")
+    print(f"calls {stats['calls']}, retries {stats['retries']}, failures {stats['failures']}, "
+          f"server saw {server.requests} ({server.rejected} rejected)")
+    print(f"fallback rate:        {stats['fallback_rate']:.1%}")
+    server.shutdown()
+    # Every request should have been split into several chunks validated in parallel
+    if stats["calls"] <= requests:
+        print(f"FAIL: {stats['calls']} LLM calls for {requests} requests, the questions were not chunked")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--rate-limit", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.questions, args.latency, args.rate_limit))
@@ -0,0 +1,54 @@
+"""
+Compare two benchmark result files (see report.py), e.g. before and after a change.
+
+    python benchmarks/compare.py old.json new.json
+
+Prints throughput and p50/p95/p99 side by side with the relative change;
+latency increases and throughput drops beyond --threshold are flagged.
+"""
+import sys
+import json
+import argparse
+
+METRICS = (("throughput", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False))
+
+
+def change(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged as a regression")
+    args = parser.parse_args()
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+
+    print(f"old: {old.get('meta', {}).get('revision')}  new: {new.get('meta', {}).get('revision')}")
+    regressions = 0
+    for section in ("micro", "load"):
+        names = [n for n in new.get(section, {}) if n in old.get(section, {})]
+        if not names:
+            continue
+        print(f"\n[{section}]")
+        print(f"{'benchmark':<32}" + "".join(f"{m:>24}" for m, _ in METRICS))
+        for name in names:
+            a, b = old[section][name], new[section][name]
+            cells = []
+            for metric, higher_is_better in METRICS:
+                delta = change(a[metric], b[metric])
+                worse = -delta if higher_is_better else delta
+                flag = "!" if worse > args.threshold else " "
+                regressions += flag == "!"
+                cells.append(f"{a[metric]:>9.2f} -> {b[metric]:>8.2f} {delta:+5.0%}{flag}")
+            print(f"{name:<32}" + "".join(f"{c:>24}" for c in cells))
+    print(f"\n{regressions} metric(s) worse by more than {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Local stand-in for the Groq chat completions API.
+
+Answers /openai/v1/chat/completions with a fixed JSON question list, after an
+optional delay, and rejects a configurable share of requests with
+429 + Retry-After so rate-limit handling can be exercised. Both regular and
+streamed (SSE) completions are supported.
+
+    python benchmarks/fake_groq.py --port 8089 --latency 0.2 --rate-limit 0.1
+    GROQ_BASE_URL=http://127.0.0.1:8089 GROQ_API_KEY=test uvicorn main:app
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT = json.dumps({"questions": [
+    {"question": "Tell me about a time you disagreed with your team.", "link": "https://example.com/hr", "type": "HR"},
+    {"question": "Design a URL shortener.", "link": "https://example.com/sd", "type": "System Design"},
+    {"question": "Two Sum", "link": "https://leetcode.com/problems/two-sum", "type": "DSA"},
+]})
+
+
+def start_fake_groq(port: int = 0, latency: float = 0.0, rate_limit: float = 0.0,
+                    retry_after: float = 0.1, content: str = CONTENT) -> ThreadingHTTPServer:
+    """Serve in a daemon thread; the server's `requests`/`rejected` attributes count traffic."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            server.requests += 1
+            if random.random() < rate_limit:
+                server.rejected += 1
+                self._send_json(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                                {"Retry-After": str(retry_after)})
+                return
+            time.sleep(latency)
+            if body.get("stream"):
+                self._stream(content)
+                return
+            self._send_json(200, {
+                "id": "fake", "object": "chat.completion", "created": int(time.time()), "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(json.dumps(body["messages"])) // 4,
+                          "completion_tokens": len(content) // 4, "total_tokens": 0},
+            })
+
+        def _send_json(self, status, payload, headers=None):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, text, step=8):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write(data):
+                data = data.encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            for i in range(0, len(text), step):
+                chunk = {"id": "fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": "fake",
+                         "choices": [{"index": 0, "delta": {"content": text[i:i + step]}, "finish_reason": None}]}
+                write(f"data: {json.dumps(chunk)}\n\n")
+            write("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.requests = 0
+    server.rejected = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per completion")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of requests answered with 429")
+    args = parser.parse_args()
+    server = start_fake_groq(args.port, args.latency, args.rate_limit)
+    print(f"Fake Groq listening on http://127.0.0.1:{server.server_port}")
+    threading.Event().wait()
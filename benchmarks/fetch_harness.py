@@ -0,0 +1,123 @@
+"""
+Local stand-in for the scraped sources, used to check the concurrent fetcher.
+
+Starts one HTTP server per fake source (each on its own port, i.e. its own
+"host"), each answering after a configurable delay, then shows that the wall
+time of fetch_all is set by the slowest source rather than the sum, that the
+overall deadline returns partial results, that the HTTP cache serves
+repeats locally and revalidates stale pages with a 304, and that the source
+registry skips a failing and a hanging source once their circuits open.
+
+    python benchmarks/fetch_harness.py
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher import fetch_all
+from http_cache import HTTPCache
+from source_health import SourceRegistry
+
+PAGE = "<html><body>" + "".join(f"<h2>Question {i}?</h2><p>answer</p>" for i in range(50)) + "</body></html>"
+
+
+def start_source(delay: float, status: int = 200) -> ThreadingHTTPServer:
+    """Serve PAGE on a free localhost port after sleeping `delay` seconds per request."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = PAGE.encode()
+            self.send_response(status)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(delays, **kwargs):
+    servers = [start_source(delay) for delay in delays]
+    urls = [f"http://127.0.0.1:{s.server_address[1]}/page" for s in servers]
+    try:
+        start = time.perf_counter()
+        results = asyncio.run(fetch_all(urls, **kwargs))
+        wall = time.perf_counter() - start
+    finally:
+        for server in servers:
+            server.shutdown()
+    return wall, results
+
+
+def main():
+    delays = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    wall, results = run(delays)
+    ok = sum(r.ok for r in results)
+    print(f"{len(delays)} sources, {ok} ok: wall {wall:.2f}s, "
+          f"slowest source {max(delays):.2f}s, sequential sum {sum(delays):.2f}s")
+    assert ok == len(delays)
+    assert wall < max(delays) + 0.5, "fetching is not concurrent"
+
+    delays = [0.1, 0.2, 5.0]
+    wall, results = run(delays, deadline=0.5)
+    ok = [r.url for r in results if r.ok]
+    failed = [r.error for r in results if not r.ok]
+    print(f"deadline 0.5s with a 5s source: wall {wall:.2f}s, {len(ok)} ok, failed: {failed}")
+    assert len(ok) == 2 and wall < 1.0, "deadline did not return partial results"
+
+    servers = [start_source(0.2) for _ in range(3)]
+    urls = [f"http://127.0.0.1:{s.server_address[1]}/page" for s in servers]
+    cache = HTTPCache(path=":memory:")
+    try:
+        asyncio.run(fetch_all(urls, cache=cache))
+        start = time.perf_counter()
+        results = asyncio.run(fetch_all(urls, cache=cache))
+        print(f"cached repeat: wall {time.perf_counter() - start:.3f}s, all from cache: {all(r.from_cache for r in results)}")
+        cache.ttl = 0
+        asyncio.run(fetch_all(urls, cache=cache))
+        cache.offline = True
+        results = asyncio.run(fetch_all(urls, cache=cache))
+        assert all(r.ok for r in results), "offline mode did not serve cached pages"
+    finally:
+        for server in servers:
+            server.shutdown()
+    stats = cache.snapshot()
+    print(f"cache stats: {stats}")
+    assert stats["hits"] == 6 and stats["revalidated"] == 3 and stats["misses"] == 3
+
+    servers = [start_source(0.05), start_source(0.05, status=403), start_source(3.0)]
+    urls = [f"http://127.0.0.1:{s.server_address[1]}/page" for s in servers]
+    registry = SourceRegistry(failure_threshold=2, min_samples=2)
+    try:
+        walls = []
+        for _ in range(4):
+            start = time.perf_counter()
+            results = asyncio.run(fetch_all(urls, timeout=1.0, health=registry))
+            walls.append(time.perf_counter() - start)
+    finally:
+        for server in servers:
+            server.shutdown()
+    states = [stats["state"] for stats in registry.snapshot().values()]
+    print(f"circuit breaking: walls {', '.join(f'{w:.2f}s' for w in walls)}, states {states}, "
+          f"skipped {sum(r.skipped for r in results)}")
+    assert states == ["closed", "open", "open"] and walls[-1] < 0.5, "failing sources were not skipped"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Cold-start check: import a module under `python -X importtime` and report the
+total import time and the most expensive imports.
+
+    python benchmarks/importtime.py [--module main] [--top 15] [--max-ms 1500]
+
+Fails (exit 1) when one of the --forbid modules (by default the langchain
+stack, bs4 and requests, which the API only needs on the interview path) gets
+imported, or when the total exceeds --max-ms. The median of --runs fresh
+interpreters is reported and merged into the "startup" section of the
+results file (see report.py).
+"""
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report import DEFAULT_OUTPUT, ROOT, write_results
+
+DEFAULT_FORBIDDEN = ("langchain", "langchain_core", "langchain_groq", "langgraph", "bs4", "requests")
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """module -> (self us, cumulative us) from one fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the median total is above this")
+    parser.add_argument("--forbid", action="append", help="modules that must not be imported (repeatable)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+    forbidden = tuple(args.forbid or DEFAULT_FORBIDDEN)
+
+    import_times(args.module)  # warm the OS page cache
+    runs: List[Dict[str, Tuple[int, int]]] = [import_times(args.module) for _ in range(args.runs)]
+    totals = sorted(run[args.module][1] for run in runs)
+    median_run = next(run for run in runs if run[args.module][1] == totals[len(totals) // 2])
+    total_ms = median_run[args.module][1] / 1e3
+
+    print(f"import {args.module}: {total_ms:.1f} ms (median of {args.runs}, "
+          f"min {totals[0] / 1e3:.1f} ms, max {totals[-1] / 1e3:.1f} ms)")
+    print(f"{'self ms':>10}{'cumulative ms':>16}  module")
+    top = sorted(median_run.items(), key=lambda item: -item[1][0])[:args.top]
+    for name, (self_us, cumulative_us) in top:
+        print(f"{self_us / 1e3:>10.1f}{cumulative_us / 1e3:>16.1f}  {name}")
+
+    imported = sorted(name for name in median_run if name.split(".")[0] in forbidden)
+    roots = sorted({name.split(".")[0] for name in imported})
+    failures = []
+    if roots:
+        failures.append(f"deferred modules imported at startup: {', '.join(roots)}")
+    if args.max_ms is not None and total_ms > args.max_ms:
+        failures.append(f"startup {total_ms:.1f} ms is above --max-ms {args.max_ms:g}")
+
+    results = {args.module: {
+        "total_ms": total_ms,
+        "min_ms": totals[0] / 1e3,
+        "max_ms": totals[-1] / 1e3,
+        "modules": len(median_run),
+        "top": [{"module": name, "self_ms": s / 1e3, "cumulative_ms": c / 1e3} for name, (s, c) in top],
+        "forbidden_imported": roots,
+    }}
+    print(f"results written to {write_results('startup', results, args.output)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+End-to-end load test of main.py, fully offline.
+
+Starts ten local stand-ins for the scraped sources (fetch_harness.start_source)
+and a fake Groq endpoint (fake_groq.py), runs the API under uvicorn in a
+subprocess pointed at them through SOURCE_URLS and GROQ_BASE_URL, and drives
+each endpoint with a fixed number of requests at a given concurrency. Results
+are merged into the "load" section of the results file (see report.py).
+
+    python benchmarks/load_test.py --requests 200 --concurrency 16 [--workers 2]
+"""
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report import DEFAULT_OUTPUT, ROOT, print_table, summarize, write_results
+from fake_groq import start_fake_groq
+from fetch_harness import start_source
+
+COMPANIES = ["google", "amazon", "microsoft", "facebook", "apple", "uber", "adobe", "bloomberg"]
+QUERIES = ["binary search tree", "dynamic programming", "system design cache", "tell me about yourself",
+           "linked list cycle", "graph shortest path"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(port: int, workers: int, env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode}")
+        try:
+            if httpx.get(base_url + "/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API did not become ready")
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, requests: int, concurrency: int):
+    """Send `requests` requests from `concurrency` workers; returns the summary."""
+    latencies, errors = [], 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            method, path, body = make_request(i)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                await response.aread()
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors, concurrency=concurrency)
+
+
+def scenarios(run_id: str):
+    rng = random.Random(0)
+    interview = {"company_name": "Google", "job_role": "Software Engineer",
+                 "job_description": "Build scalable distributed systems"}
+    return {
+        "dsa_questions": lambda i: ("POST", "/generate_dsa_questions",
+                                    {"company_name": rng.choice(COMPANIES), "limit": 50}),
+        "search_index_only": lambda i: ("POST", "/search", {"query": f"{rng.choice(QUERIES)} {i % 20}",
+                                                            "use_llm": "never"}),
+        # A unique description per request defeats the result cache: full pipeline every time
+        "interview_questions": lambda i: ("POST", "/generate_interview_questions",
+                                          {**interview, "job_description": f"{run_id} request {i}"}),
+        "interview_questions_cached": lambda i: ("POST", "/generate_interview_questions", interview),
+        "interview_questions_stream": lambda i: ("POST", "/generate_interview_questions/stream",
+                                                 {**interview, "job_description": f"{run_id} stream {i}"}),
+    }
+
+
+async def drive(base_url: str, requests: int, concurrency: int, only):
+    results = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        for name, make_request in scenarios(str(time.time())).items():
+            if only and name not in only:
+                continue
+            results[name] = await run_scenario(client, make_request, requests, concurrency)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--source-delay", type=float, default=0.05, help="seconds per fake source page")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake completion")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    sources = [start_source(args.source_delay) for _ in range(10)]
+    groq = start_fake_groq(latency=args.llm_latency)
+    workdir = tempfile.mkdtemp(prefix="ez_search_load_")
+    port = free_port()
+    api = start_api(port, args.workers, {
+        "SOURCE_URLS": ",".join(f"http://127.0.0.1:{s.server_port}/source-{i}" for i, s in enumerate(sources)),
+        "GROQ_BASE_URL": f"http://127.0.0.1:{groq.server_port}",
+        "GROQ_API_KEY": "load-test",
+        "HTTP_CACHE_PATH": os.path.join(workdir, "http_cache.sqlite3"),
+        "CORPUS_DIR": os.path.join(workdir, "corpus"),
+        "JOB_STORE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "FETCH_OFFLINE": "",
+        "TRACE_LOG": "",
+    }, os.path.join(workdir, "api.log"))
+    try:
+        wait_ready(f"http://127.0.0.1:{port}", api)
+        results = asyncio.run(drive(f"http://127.0.0.1:{port}", args.requests, args.concurrency, args.scenario))
+    finally:
+        api.terminate()
+        api.wait(timeout=30)
+        groq.shutdown()
+        for server in sources:
+            server.shutdown()
+    for summary in results.values():
+        summary.update(workers=args.workers, source_delay=args.source_delay, llm_latency=args.llm_latency)
+    print_table(results)
+    print(f"API log: {os.path.join(workdir, 'api.log')}")
+    print(f"results written to {write_results('load', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Micro-benchmarks of the hot paths that don't touch the network: DSA lookups,
+HTML extraction, deduplication and JSON serialization. Results are merged
+into the "micro" section of the results file (see report.py).
+
+HTML extraction uses the pages in benchmarks/fixtures/*.html, each with the
+extraction rule of its source (see bench_extractors.load_fixtures), or a
+synthetic page when there are none.
+
+    python benchmarks/micro.py [--output results.json] [--seconds 1.0]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from report import DEFAULT_OUTPUT, print_table, summarize, write_results
+from bench_extractors import FIXTURES_DIR, load_fixtures
+
+
+def measure(fn, seconds: float, min_ops: int = 20):
+    """Call fn() repeatedly for about `seconds`, timing each call."""
+    fn()  # warm-up
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline or len(latencies) < min_ops:
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def dsa_benchmarks(seconds):
+    from dsa_repository import get_repository
+
+    repository = get_repository()
+    rng = random.Random(0)
+    companies = list(repository.companies)
+    largest = max(companies, key=lambda c: len(repository.store.company_question_ids(c)))
+    typos = [c[:-1] + "x" if len(c) > 3 else c for c in rng.sample(companies, min(50, len(companies)))]
+    next_company = iter(lambda: rng.choice(companies), None)
+    next_typo = iter(lambda: rng.choice(typos), None)
+    return {
+        "dsa_get": measure(lambda: repository.get(next(next_company)), seconds),
+        "dsa_query_filtered": measure(lambda: repository.query(
+            next(next_company), difficulties=["Medium", "Hard"], sort_by="difficulty", limit=25), seconds),
+        "dsa_resolve_typo": measure(lambda: repository.resolve(next(next_typo)), seconds),
+        "dsa_suggest_prefix": measure(lambda: repository.suggest(next(next_company)[:3]), seconds),
+        "dsa_rank": measure(lambda: repository.rank("dynamic programming on graphs", 10, largest), seconds),
+        "dsa_search": measure(lambda: repository.search("binary search tree", 20), seconds),
+        "dsa_aggregate_5_companies": measure(lambda: repository.store.aggregate(
+            rng.sample(companies, 5), difficulties=["Medium"], limit=50), seconds),
+    }
+
+
+def extraction_benchmarks(seconds, fixtures_dir):
+    from extractors import BACKENDS, default_backend
+    from dedup import deduplicate
+
+    pages = list(load_fixtures(fixtures_dir).values())
+    results = {}
+    for name, extract in BACKENDS.items():
+        results[f"extract_{name}"] = measure(lambda: [extract(html, rule) for html, rule in pages], seconds)
+        results[f"extract_{name}"]["pages"] = len(pages)
+    questions = [{"question": text, "link": f"https://source-{i}.example/"}
+                 for i, (html, rule) in enumerate(pages) for text in BACKENDS[default_backend()](html, rule)]
+    results["dedup_minhash"] = measure(lambda: deduplicate(questions), seconds)
+    results["dedup_minhash"]["questions"] = len(questions)
+    return results
+
+
+def serialization_benchmarks(seconds):
+    from dsa_repository import get_repository
+    from prompt_builder import compact_json
+    from json_codec import dumps
+
+    repository = get_repository()
+    company = max(repository.companies, key=lambda c: len(repository.store.company_question_ids(c)))
+    dsa_body = {company: repository.get(company)}
+    questions = [{"question": f"How would you design component {i} of a large system?",
+                  "link": "https://example.com/interview", "type": "HR"} for i in range(300)]
+    return {
+        "json_dsa_response": measure(lambda: json.dumps(dsa_body), seconds),
+        "json_dsa_response_codec": measure(lambda: dumps(dsa_body), seconds),
+        "json_dsa_response_encoded_hit": measure(lambda: repository.encoded_query(company), seconds),
+        "json_questions_indented": measure(lambda: json.dumps(questions, indent=4), seconds),
+        "json_questions_compact": measure(lambda: compact_json(questions), seconds),
+        "json_questions_codec": measure(lambda: dumps(questions), seconds),
+        "json_questions_parse": measure(lambda: json.loads(json.dumps(questions, indent=4)), seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent on each benchmark")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    # Keep the modules' progress prints out of the table
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        results = {}
+        results.update(dsa_benchmarks(args.seconds))
+        results.update(extraction_benchmarks(args.seconds, args.fixtures))
+        results.update(serialization_benchmarks(args.seconds))
+    finally:
+        sys.stdout = stdout
+    print_table(results)
+    print(f"results written to {write_results('micro', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
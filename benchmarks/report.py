@@ -0,0 +1,78 @@
+"""
+Shared result format for the benchmark suite.
+
+Every benchmark is summarized as ops/s plus latency percentiles (in ms) and
+merged into one JSON file per run:
+
+    {"meta": {"revision": ..., "timestamp": ..., ...},
+     "micro": {"dsa_query": {...}, ...},
+     "load": {"interview_questions": {...}, ...}}
+
+Compare two runs with `python benchmarks/compare.py old.json new.json`.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from typing import Any, Dict, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT, ".cache", "benchmarks", "results.json")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def summarize(latencies: Sequence[float], wall: Optional[float] = None, errors: int = 0, **extra) -> Dict[str, Any]:
+    """Throughput and p50/p95/p99 of per-operation latencies given in seconds."""
+    wall = sum(latencies) if wall is None else wall
+    summary = {
+        "ops": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / wall, 3) if wall else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1e3, 4) if latencies else 0.0,
+    }
+    for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        summary[f"{name}_ms"] = round(percentile(latencies, q) * 1e3, 4)
+    summary.update(extra)
+    return summary
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(section: str, results: Dict[str, Any], path: str = DEFAULT_OUTPUT) -> str:
+    """Merge `results` into `section` of the results file (other sections are kept)."""
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        data = {}
+    data["meta"] = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    data.setdefault(section, {}).update(results)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+    return path
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<32}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<32}{r['throughput']:>12.1f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+              f"{r['p99_ms']:>10.3f}{r['errors']:>8}")
@@ -0,0 +1,151 @@
+"""
+Company-name resolution for user input like "Goldman Sachs", "goldman-sachs" or
+"Amazon Web Services".
+
+Built once over the company keys of dsa.json: names are normalized to lowercase
+alphanumerics, prefixes are answered from a trie with precomputed completions,
+and typos are matched through a trigram index followed by a bounded edit
+distance check.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Suffixes that don't help identify a company ("Goldman Sachs Inc.", "Uber Technologies")
+_STOP_WORDS = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "technologies", "the"}
+
+
+def tokenize(name: str) -> List[str]:
+    """Lowercase `name` and split it into alphanumeric words."""
+    return [t for t in _NON_ALNUM.split(name.lower()) if t]
+
+
+def normalize(name: str) -> str:
+    """Collapse case, punctuation and spacing: "Goldman-Sachs " -> "goldmansachs"."""
+    return "".join(tokenize(name))
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Levenshtein distance between a and b, or None once it exceeds max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class _TrieNode:
+    __slots__ = ("children", "completions")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.completions: List[str] = []
+
+
+class CompanyResolver:
+    """Maps free-form company names onto the known company keys."""
+
+    def __init__(self, companies: Iterable[str], max_completions: int = 20):
+        self._by_normalized: Dict[str, str] = {}
+        for company in companies:
+            # Keep the first key when two spellings normalize the same way
+            self._by_normalized.setdefault(normalize(company), company)
+
+        self._root = _TrieNode()
+        self._trigram_index: Dict[str, List[str]] = defaultdict(list)
+        # Shorter names first so "booking" is suggested before "bookingcom"
+        for normalized in sorted(self._by_normalized, key=lambda n: (len(n), n)):
+            node = self._root
+            node.completions.append(normalized)
+            for ch in normalized:
+                node = node.children.setdefault(ch, _TrieNode())
+                if len(node.completions) < max_completions:
+                    node.completions.append(normalized)
+            for gram in _trigrams(normalized):
+                self._trigram_index[gram].append(normalized)
+        self._root.completions = self._root.completions[:max_completions]
+
+    def _prefix_completions(self, normalized: str) -> List[str]:
+        node = self._root
+        for ch in normalized:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.completions
+
+    def _fuzzy_matches(self, normalized: str, limit: int) -> List[Tuple[int, str]]:
+        """Candidates sharing trigrams with `normalized`, within the edit distance bound."""
+        max_distance = 1 if len(normalized) <= 5 else 2
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in _trigrams(normalized):
+            for candidate in self._trigram_index.get(gram, ()):
+                shared[candidate] += 1
+        ranked = sorted(shared, key=lambda c: -shared[c])[:limit * 4]
+        matches = []
+        for candidate in ranked:
+            distance = bounded_edit_distance(normalized, candidate, max_distance)
+            if distance is not None:
+                matches.append((distance, candidate))
+        matches.sort()
+        return matches[:limit]
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Return the company key for `name`, or None if nothing matches confidently.
+
+        Tries, in order: the exact normalized name, the longest leading run of
+        words that is a known company ("Amazon Web Services" -> "amazon"), a
+        unique prefix completion, and finally the closest name by edit distance.
+        """
+        tokens = [t for t in tokenize(name) if t not in _STOP_WORDS] or tokenize(name)
+        if not tokens:
+            return None
+        normalized = "".join(tokens)
+        company = self._by_normalized.get(normalized)
+        if company is not None:
+            return company
+
+        for end in range(len(tokens) - 1, 0, -1):
+            company = self._by_normalized.get("".join(tokens[:end]))
+            if company is not None:
+                return company
+
+        completions = self._prefix_completions(normalized)
+        if len(completions) == 1:
+            return self._by_normalized[completions[0]]
+
+        matches = self._fuzzy_matches(normalized, 2)
+        # Only accept a typo correction when it is unambiguous
+        if matches and (len(matches) == 1 or matches[0][0] < matches[1][0]):
+            return self._by_normalized[matches[0][1]]
+        return None
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """Autocomplete: prefix completions first, topped up with fuzzy matches."""
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        suggestions = list(self._prefix_completions(normalized)[:limit])
+        if len(suggestions) < limit:
+            for _, candidate in self._fuzzy_matches(normalized, limit):
+                if candidate not in suggestions:
+                    suggestions.append(candidate)
+                    if len(suggestions) == limit:
+                        break
+        return [self._by_normalized[s] for s in suggestions]
@@ -0,0 +1,158 @@
+"""
+Noise filtering and near-duplicate removal for scraped interview questions.
+
+The sources are scraped by heading, so the raw list carries page-structure
+headings ("Conclusion", "FAQs", "Top 50 HR Interview Questions") and the same
+question worded slightly differently on several sites. Headings matching the
+blocklist are dropped, and the rest are deduplicated with MinHash signatures
+over character shingles: locality-sensitive hashing (LSH) buckets the
+signatures by band, so only questions sharing a bucket are compared and the
+pass stays near-linear in the number of questions. The first occurrence, in
+source order, is kept.
+"""
+import os
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from telemetry import count
+
+SHINGLE_SIZE = 4  # characters
+NUM_PERM = 64
+LSH_BANDS = 16  # NUM_PERM / LSH_BANDS rows per band; candidates from ~(1 / bands) ** (1 / rows) = 0.5 similarity
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.6))  # estimated Jaccard similarity of the shingle sets
+
+_WORD = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 31) - 1  # a * x + b stays below 2 ** 64 for 32-bit shingle hashes
+
+# Page-structure headings that are never interview questions
+GENERIC_HEADINGS = frozenset({
+    "conclusion", "conclusions", "faq", "faqs", "introduction", "summary", "contents",
+    "table of contents", "references", "related articles", "related posts", "recommended",
+    "share", "comments", "about", "about us", "contact", "contact us", "resources",
+    "frequently asked questions", "final thoughts", "key takeaways", "next steps", "what s next",
+    "additional resources", "further reading", "similar reads", "more from", "popular posts",
+    "sign up", "subscribe", "login", "newsletter", "follow us", "leave a reply", "related courses",
+})
+HEADING_PATTERNS = re.compile(
+    r"^(?:"
+    r"(?:top|best|most|common|\d+) .*(?:interview )?questions(?: and answers)?(?: for .*| in \d{4})?"  # list titles
+    r"|(?:basic|advanced|intermediate|general|technical|behavioral|hr|dsa) (?:level )?(?:interview )?questions.*"
+    r"|(?:part|section|chapter|step) \d+"
+    r"|\d+"
+    r")$"
+)
+
+
+def _normalize(text: str) -> str:
+    """Lowercase words without punctuation or a leading list number ("1. What is ..." -> "what is ...")."""
+    words = _WORD.findall(text.lower())
+    if len(words) > 1 and words[0].isdigit():
+        words = words[1:]
+    return " ".join(words)
+
+
+def is_noise(text: str) -> bool:
+    """True for headings that are page structure rather than a question."""
+    normalized = _normalize(text)
+    return (not normalized or len(text) > 300 or normalized in GENERIC_HEADINGS
+            or HEADING_PATTERNS.match(normalized) is not None)
+
+
+class MinHashLSH:
+    """MinHash signatures of character shingles, bucketed by band for candidate lookup."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = LSH_BANDS, shingle_size: int = SHINGLE_SIZE,
+                 seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: List[np.ndarray] = []
+
+    def _shingles(self, text: str) -> set:
+        normalized = _normalize(text)
+        k = self.shingle_size
+        return {normalized[i:i + k] for i in range(max(1, len(normalized) - k + 1))}
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), num_perm) MinHash signatures, computed for all texts in one pass."""
+        shingle_sets = [self._shingles(text) for text in texts]
+        if not shingle_sets:
+            return np.empty((0, len(self._a)), dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for shingles in shingle_sets for s in shingles),
+                             dtype=np.uint64)
+        starts = np.cumsum([0] + [len(shingles) for shingles in shingle_sets[:-1]])
+        # (a * x + b) mod p for every permutation and shingle, then the minimum per text
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return np.minimum.reduceat(permuted, starts, axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    def query(self, signature: np.ndarray, threshold: float) -> Optional[int]:
+        """Id of an indexed signature with estimated similarity >= threshold, or None."""
+        seen = set()
+        needed = threshold * len(signature)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            for other in bucket.get(key, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                if np.count_nonzero(self._signatures[other] == signature) >= needed:
+                    return other
+        return None
+
+    def add(self, signature: np.ndarray) -> int:
+        item_id = len(self._signatures)
+        self._signatures.append(signature)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket[key].append(item_id)
+        return item_id
+
+
+def _source(question: Dict[str, Any]) -> str:
+    link = question.get("link", "")
+    return urlsplit(link.strip()).hostname or link or "unknown"
+
+
+def deduplicate(questions: List[Dict[str, Any]], threshold: float = DEDUP_THRESHOLD
+                ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Drop noise headings and near-duplicate questions.
+
+    Returns:
+        (kept questions in their original order,
+         {"kept": n, "removed": {source host: {"noise": n, "duplicates": n}}})
+    """
+    index = MinHashLSH()
+    kept = []
+    removed: Dict[str, Dict[str, int]] = defaultdict(lambda: {"noise": 0, "duplicates": 0})
+    candidates = []
+    for question in questions:
+        if is_noise(question.get("question", "")):
+            removed[_source(question)]["noise"] += 1
+        else:
+            candidates.append(question)
+    signatures = index.signatures([q.get("question", "") for q in candidates])
+    for question, signature in zip(candidates, signatures):
+        if index.query(signature, threshold) is not None:
+            removed[_source(question)]["duplicates"] += 1
+            continue
+        index.add(signature)
+        kept.append(question)
+    for source, reasons in removed.items():
+        for reason, n in reasons.items():
+            if n:
+                count("questions_removed", n, source=source, reason=reason)
+    return kept, {"kept": len(kept), "removed": dict(removed)}
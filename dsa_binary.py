@@ -0,0 +1,380 @@
+"""
+Memory-mapped binary form of the DSA store, shared by all worker processes.
+
+Every uvicorn worker that parses dsa.json keeps a private copy of it. The
+binary file built here is instead mapped read-only with mmap, so the workers
+share one set of page-cache pages and opening it costs next to nothing.
+Lookups read the mapped buffer directly; Question objects are only built for
+the rows a query returns.
+
+Layout (little-endian, every section 8-byte aligned, located via the header):
+
+    header          magic, version, counts, then (offset, length) per section
+    string_offsets  u32[n_strings + 1] into string_data
+    string_data     UTF-8 bytes of every distinct string
+    records         RECORD per question (fixed width)
+    topics          u32 string ids, RECORD.topics_start/count index into it
+    asked_by        u16 company indexes, RECORD.asked_by_start/count index into it
+    company_counts  u16 number of companies asking each question
+    companies       COMPANY per company, sorted by name
+    company_ids     u16 question ids, COMPANY.ids_start/count index into it
+    postings        POSTING per (company, difficulty) and (company, subtopic), sorted by
+                    string id within each company; COMPANY.difficulties/subtopics_start/count
+                    index into it
+    positions       u16 positions in the company's company_ids slice, POSTING.start/count
+                    index into it
+    difficulties    u32 string ids of the difficulty vocabulary
+    subtopics       u32 string ids of the subtopic vocabulary
+    rank_<sort_by>  u16 position of each question in that ordering (see SORT_KEYS)
+
+Difficulty and subtopic filters are answered from the per-company postings
+(the counterpart of CompactDSAStore's bitsets), without reading any records.
+
+Build it from dsa.json (or the compact JSON layout) and point DSA_PATH at it:
+
+    python dsa_binary.py dsa.json dsa.bin
+"""
+import os
+import sys
+import mmap
+import struct
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from dsa_store import SORT_KEYS, CompactDSAStore, Question
+
+MAGIC = b"DSAB"
+BINARY_FORMAT_VERSION = 2
+
+SECTIONS = (
+    "string_offsets", "string_data", "records", "topics", "asked_by", "company_counts",
+    "companies", "company_ids", "postings", "positions", "difficulties", "subtopics",
+) + tuple(f"rank_{sort_by}" for sort_by in SORT_KEYS)
+
+HEADER = struct.Struct("<4sIIII" + "QQ" * len(SECTIONS))
+# question_no, name, difficulty, link (string ids), topics_start, asked_by_start, topics_count, asked_by_count
+RECORD = struct.Struct("<IIIIIIHH")
+# name (string id), ids_start, ids_count, difficulties_start, difficulties_count, subtopics_start, subtopics_count
+COMPANY = struct.Struct("<IIIIIII")
+# difficulty or subtopic (string id), positions_start, positions_count
+POSTING = struct.Struct("<III")
+
+
+def write_binary(store: CompactDSAStore, path: str) -> None:
+    """Write `store` in the binary layout; the file is renamed into place so open mappings stay valid."""
+    strings: Dict[str, int] = {}
+
+    def sid(text: str) -> int:
+        return strings.setdefault(text, len(strings))
+
+    companies = sorted(store.companies)
+    company_index = {company: i for i, company in enumerate(companies)}
+    records = bytearray()
+    topics = array("I")
+    asked_by = array("H")
+    for q in store.questions:
+        asked = store.question_companies[q.id]
+        records += RECORD.pack(q.question_no, sid(q.question_name), sid(q.difficulty), sid(q.question_link),
+                               len(topics), len(asked_by), len(q.subtopics), len(asked))
+        topics.extend(sid(t) for t in q.subtopics)
+        asked_by.extend(company_index[c] for c in asked)
+
+    company_table = bytearray()
+    company_ids = array("H")
+    postings = bytearray()
+    positions = array("H")
+
+    def write_postings(by_string: Dict[int, List[int]]) -> Tuple[int, int]:
+        start = len(postings) // POSTING.size
+        for string_id in sorted(by_string):
+            postings.extend(POSTING.pack(string_id, len(positions), len(by_string[string_id])))
+            positions.extend(by_string[string_id])
+        return start, len(by_string)
+
+    for company in companies:
+        ids = store.companies[company]
+        by_difficulty: Dict[int, List[int]] = {}
+        by_subtopic: Dict[int, List[int]] = {}
+        for position, question_id in enumerate(ids):
+            q = store.questions[question_id]
+            by_difficulty.setdefault(sid(q.difficulty), []).append(position)
+            for topic in dict.fromkeys(q.subtopics):
+                by_subtopic.setdefault(sid(topic), []).append(position)
+        company_table += COMPANY.pack(sid(company), len(company_ids), len(ids),
+                                      *write_postings(by_difficulty), *write_postings(by_subtopic))
+        company_ids.extend(ids)
+
+    ranks = {}
+    for sort_by, key in SORT_KEYS.items():
+        rank = array("H", bytes(2 * len(store.questions)))
+        for position, q in enumerate(sorted(store.questions, key=key)):
+            rank[q.id] = position
+        ranks[f"rank_{sort_by}"] = rank
+
+    offsets = array("I", [0])
+    data = bytearray()
+    for text in strings:
+        data += text.encode("utf-8")
+        offsets.append(len(data))
+
+    sections = {
+        "string_offsets": offsets.tobytes(),
+        "string_data": bytes(data),
+        "records": bytes(records),
+        "topics": topics.tobytes(),
+        "asked_by": asked_by.tobytes(),
+        "company_counts": store.company_counts.tobytes(),
+        "companies": bytes(company_table),
+        "company_ids": company_ids.tobytes(),
+        "postings": bytes(postings),
+        "positions": positions.tobytes(),
+        "difficulties": array("I", sorted({strings[q.difficulty] for q in store.questions})).tobytes(),
+        "subtopics": array("I", sorted({strings[t] for q in store.questions for t in q.subtopics})).tobytes(),
+        **{name: rank.tobytes() for name, rank in ranks.items()},
+    }
+    if sys.byteorder != "little":
+        raise RuntimeError("dsa_binary files are little-endian; build them on a little-endian host")
+
+    body = bytearray()
+    table = []
+    for name in SECTIONS:
+        body += bytes(-(HEADER.size + len(body)) % 8)
+        table += [HEADER.size + len(body), len(sections[name])]
+        body += sections[name]
+    header = HEADER.pack(MAGIC, BINARY_FORMAT_VERSION, len(store.questions), len(companies), len(strings), *table)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header)
+        file.write(body)
+    os.replace(tmp_path, path)
+
+
+def is_binary(path: str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+class _Questions(Sequence):
+    """store.questions: builds each Question when it is accessed."""
+
+    def __init__(self, store: "MappedDSAStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.question_count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._store.question(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._store.question(i)
+
+    def __iter__(self) -> Iterator[Question]:
+        return map(self._store.question, range(len(self)))
+
+
+class _QuestionCompanies(Sequence):
+    """store.question_companies: the companies asking question i, in company order."""
+
+    def __init__(self, store: "MappedDSAStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.question_count
+
+    def __getitem__(self, i: int) -> Tuple[str, ...]:
+        store = self._store
+        *_, start, _, count = RECORD.unpack_from(store._records, i * RECORD.size)
+        names = store._company_names
+        return tuple(names[c] for c in store._asked_by[start:start + count])
+
+
+class _Companies(Mapping):
+    """store.companies: company -> zero-copy u16 view of its question ids."""
+
+    def __init__(self, ids: memoryview, spans: Dict[str, Tuple[int, ...]]):
+        self._ids = ids
+        self._spans = spans
+
+    def __getitem__(self, company: str) -> memoryview:
+        start, count = self._spans[company][:2]
+        return self._ids[start:start + count]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+class MappedDSAStore:
+    """
+    Read-only store over a buffer in the dsa_binary layout, with the same query
+    interface as CompactDSAStore.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, version, self.question_count, company_count, _, *table = HEADER.unpack_from(view)
+        if magic != MAGIC or version != BINARY_FORMAT_VERSION:
+            raise ValueError(f"Not a version {BINARY_FORMAT_VERSION} dsa_binary file")
+        sections = {name: view[table[2 * i]:table[2 * i] + table[2 * i + 1]] for i, name in enumerate(SECTIONS)}
+        self._string_offsets = sections["string_offsets"].cast("I")
+        self._string_data = sections["string_data"]
+        self._records = sections["records"]
+        self._topics = sections["topics"].cast("I")
+        self._asked_by = sections["asked_by"].cast("H")
+        self.company_counts = sections["company_counts"].cast("H")
+        self._ranks = {sort_by: sections[f"rank_{sort_by}"].cast("H") for sort_by in SORT_KEYS}
+        # Small lookup tables; everything per question stays in the buffer
+        self._vocabulary: Dict[int, str] = {}
+        self._difficulty_ids = self._vocabulary_ids(sections["difficulties"].cast("I"))
+        self._subtopic_ids = self._vocabulary_ids(sections["subtopics"].cast("I"))
+        self._postings = sections["postings"]
+        self._positions = sections["positions"].cast("H")
+        spans = {}
+        for i in range(company_count):
+            name, *span = COMPANY.unpack_from(sections["companies"], i * COMPANY.size)
+            spans[self._string(name)] = tuple(span)
+        self._company_spans = spans
+        self._company_names = list(spans)
+        self.companies = _Companies(sections["company_ids"].cast("H"), spans)
+        self.questions = _Questions(self)
+        self.question_companies = _QuestionCompanies(self)
+
+    @classmethod
+    def open(cls, path: str) -> "MappedDSAStore":
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _string(self, string_id: int) -> str:
+        offsets = self._string_offsets
+        return str(self._string_data[offsets[string_id]:offsets[string_id + 1]], "utf-8")
+
+    def _vocabulary_ids(self, string_ids: memoryview) -> Dict[str, List[int]]:
+        """Lowercased difficulty/subtopic -> the string ids spelling it."""
+        ids: Dict[str, List[int]] = {}
+        for string_id in string_ids:
+            text = self._vocabulary[string_id] = sys.intern(self._string(string_id))
+            ids.setdefault(text.lower(), []).append(string_id)
+        return ids
+
+    def question(self, question_id: int) -> Question:
+        question_no, name, difficulty, link, topics_start, _, topics_count, _ = RECORD.unpack_from(
+            self._records, question_id * RECORD.size
+        )
+        vocabulary = self._vocabulary
+        topics = tuple(vocabulary[t] for t in self._topics[topics_start:topics_start + topics_count])
+        return Question(question_id, question_no, self._string(name), vocabulary[difficulty], topics,
+                        self._string(link))
+
+    def company_question_ids(self, company_name: str) -> Optional[memoryview]:
+        return self.companies.get(company_name)
+
+    def company_questions(self, company_name: str) -> Optional[List[Question]]:
+        ids = self.companies.get(company_name)
+        if ids is None:
+            return None
+        return [self.question(i) for i in ids]
+
+    def _posting_positions(self, start: int, count: int, string_ids: Iterable[int]) -> set:
+        """Union of the company positions listed under `string_ids` in postings[start:start + count]."""
+        wanted = set(string_ids)
+        matched = set()
+        if not wanted:
+            return matched
+        table = self._postings[start * POSTING.size:(start + count) * POSTING.size]
+        for string_id, positions_start, positions_count in POSTING.iter_unpack(table):
+            if string_id in wanted:
+                matched.update(self._positions[positions_start:positions_start + positions_count])
+        return matched
+
+    def _filtered_ids(self, company_name: str, difficulties: Optional[Iterable[str]],
+                      subtopics: Optional[Iterable[str]], match_all_subtopics: bool) -> List[int]:
+        """The company's question ids (deduplicated, order kept) passing the filters, from its postings."""
+        ids = self.companies[company_name]
+        if not difficulties and not subtopics:
+            return list(dict.fromkeys(ids))
+        _, count, difficulties_start, difficulties_count, subtopics_start, subtopics_count = (
+            self._company_spans[company_name]
+        )
+        positions = None
+        if difficulties:
+            positions = self._posting_positions(
+                difficulties_start, difficulties_count,
+                (d for name in difficulties for d in self._difficulty_ids.get(name.lower(), ()))
+            )
+        if subtopics:
+            if match_all_subtopics:
+                for name in subtopics:
+                    tagged = self._posting_positions(subtopics_start, subtopics_count,
+                                                     self._subtopic_ids.get(name.lower(), ()))
+                    positions = tagged if positions is None else positions & tagged
+            else:
+                tagged = self._posting_positions(
+                    subtopics_start, subtopics_count,
+                    (t for name in subtopics for t in self._subtopic_ids.get(name.lower(), ()))
+                )
+                positions = tagged if positions is None else positions & tagged
+        return list(dict.fromkeys(ids[p] for p in sorted(positions)))
+
+    def query(self, company_name: str, difficulties: Optional[Iterable[str]] = None,
+              subtopics: Optional[Iterable[str]] = None, match_all_subtopics: bool = False,
+              sort_by: Optional[str] = None, descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> Optional[Tuple[int, List[Question]]]:
+        """Same contract as CompactDSAStore.query; orderings come from the precomputed rank arrays."""
+        if sort_by is not None and sort_by not in self._ranks:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        if company_name not in self.companies:
+            return None
+        matched = self._filtered_ids(company_name, difficulties, subtopics, match_all_subtopics)
+        if sort_by is not None:
+            matched.sort(key=self._ranks[sort_by].__getitem__, reverse=descending)
+        elif descending:
+            matched.reverse()
+        page = matched[offset:] if limit is None else matched[offset:offset + limit]
+        return len(matched), [self.question(i) for i in page]
+
+    def aggregate(self, company_names: Iterable[str], difficulties: Optional[Iterable[str]] = None,
+                  subtopics: Optional[Iterable[str]] = None, match_all_subtopics: bool = False,
+                  limit: Optional[int] = None) -> List[Tuple[Question, Tuple[str, ...]]]:
+        """Same contract as CompactDSAStore.aggregate."""
+        requested = set()
+        counts: Counter = Counter()
+        for company in company_names:
+            if company not in self.companies or company in requested:
+                continue
+            requested.add(company)
+            counts.update(self._filtered_ids(company, difficulties, subtopics, match_all_subtopics))
+        company_counts = self.company_counts
+        ranked = sorted(counts, key=lambda i: (-counts[i], -company_counts[i], i))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self.question(i), tuple(c for c in self.question_companies[i] if c in requested)) for i in ranked]
+
+
+def load_store(path: str):
+    """A MappedDSAStore for a dsa_binary file, otherwise a CompactDSAStore parsed from JSON."""
+    if is_binary(path):
+        return MappedDSAStore.open(path)
+    return CompactDSAStore.load(path)
+
+
+def build(src_path: str, dst_path: str) -> None:
+    store = CompactDSAStore.load(src_path)
+    write_binary(store, dst_path)
+    print(f"Wrote {len(store.questions)} questions for {len(store.companies)} companies "
+          f"({os.path.getsize(dst_path) / 1024:.0f} KB): {dst_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python dsa_binary.py <dsa.json> <dsa.bin>")
+        sys.exit(1)
+    build(sys.argv[1], sys.argv[2])
@@ -0,0 +1,232 @@
+import os
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dsa_store import CompactDSAStore
+from dsa_binary import load_store
+from company_resolver import CompanyResolver
+from ranking import TfidfIndex, dsa_text, load_dsa_index
+from search_index import BM25Index
+from json_codec import dumps
+
+# The raw dsa.json, the output of `python dsa_store.py` or a binary file from
+# `python dsa_binary.py` (memory-mapped and shared by all worker processes) can be served
+DEFAULT_DSA_PATH = os.getenv(
+    "DSA_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "dsa.json")
+)
+# Encoded /generate_dsa_questions bodies kept per (company, filters)
+DEFAULT_ENCODED_CACHE_ENTRIES = int(os.getenv("DSA_RESPONSE_CACHE_ENTRIES", 1024))
+
+
+class DSARepository:
+    """
+    In-memory, read-only index of the company -> DSA questions data in dsa.json.
+
+    A JSON file is parsed once into an immutable CompactDSAStore, where each unique
+    question is stored once and companies hold arrays of question ids; a
+    dsa_binary file is memory-mapped into a MappedDSAStore instead. Lookups
+    re-check the file's mtime (at most once per `check_interval` seconds) and
+    transparently reload it when it has changed.
+    """
+
+    def __init__(self, path: str = DEFAULT_DSA_PATH, check_interval: float = 1.0,
+                 encoded_cache_entries: int = DEFAULT_ENCODED_CACHE_ENTRIES):
+        self.path = path
+        self.check_interval = check_interval
+        self.encoded_cache_entries = encoded_cache_entries
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._last_check = 0.0
+        self._store = CompactDSAStore((), {})
+        self._resolver = CompanyResolver(())
+        self._rank_index: Optional[TfidfIndex] = None
+        self._search_index: Optional[BM25Index] = None
+        self._encoded: "OrderedDict[tuple, Tuple[int, bytes]]" = OrderedDict()
+
+    def load(self) -> None:
+        """Parse the file and atomically swap in a fresh index."""
+        with self._lock:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            store = load_store(self.path)
+            resolver = CompanyResolver(store.companies)
+            self._store, self._resolver = store, resolver
+            self._rank_index = None
+            self._search_index = None
+            self._encoded = OrderedDict()
+            self._mtime_ns = mtime_ns
+            self._last_check = time.monotonic()
+        print(f"DSA Repository: Loaded {len(self._store.companies)} companies "
+              f"({len(self._store.questions)} unique questions) from {self.path}")
+
+    def _reload_if_stale(self) -> None:
+        now = time.monotonic()
+        if self._mtime_ns is not None and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            # Keep serving the last good index if the file is briefly missing
+            print(f"DSA Repository: Could not stat {self.path}: {e}")
+            return
+        if mtime_ns != self._mtime_ns:
+            self.load()
+
+    @property
+    def store(self) -> CompactDSAStore:
+        self._reload_if_stale()
+        return self._store
+
+    @property
+    def companies(self) -> Tuple[str, ...]:
+        return tuple(self.store.companies)
+
+    def resolve(self, company_name: str) -> Optional[str]:
+        """Map free-form input ("Goldman Sachs", "amazn") to a company key, or None."""
+        self._reload_if_stale()
+        return self._resolver.resolve(company_name)
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """Company keys for autocomplete, prefix matches first."""
+        self._reload_if_stale()
+        return self._resolver.suggest(query, limit)
+
+    def get(self, company_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the questions for a company as dsa.json-style dicts, or None if unknown."""
+        questions = self.store.company_questions(company_name.lower())
+        if questions is None:
+            return None
+        return [q.to_dict() for q in questions]
+
+    def query(self, company_name: str, **filters) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Filtered/sorted/paginated lookup, see CompactDSAStore.query for the filters.
+
+        Returns (total matches, page of dsa.json-style dicts), or None if unknown.
+        """
+        result = self.store.query(company_name.lower(), **filters)
+        if result is None:
+            return None
+        total, questions = result
+        return total, [q.to_dict() for q in questions]
+
+    def encoded_query(self, company_name: str, **filters) -> Optional[Tuple[int, bytes]]:
+        """
+        Like query(), but returns the {company: [...]} response body already encoded as JSON bytes.
+
+        Bodies are kept in an LRU keyed by company and filters, so a repeated
+        request is served without any serialization. The LRU is dropped on reload.
+        """
+        company_name = company_name.lower()
+        key = (company_name,) + tuple(
+            (name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(filters.items())
+        )
+        store = self.store
+        encoded = self._encoded
+        cached = encoded.get(key)
+        if cached is not None:
+            encoded.move_to_end(key)
+            return cached
+        result = store.query(company_name, **filters)
+        if result is None:
+            return None
+        total, questions = result
+        cached = (total, dumps({company_name: [q.to_dict() for q in questions]}))
+        encoded[key] = cached
+        while len(encoded) > self.encoded_cache_entries:
+            encoded.popitem(last=False)
+        return cached
+
+
+    def encoded_bulk(self, company_names: Iterable[str], aggregate_limit: Optional[int] = None,
+                     difficulties: Optional[List[str]] = None, subtopics: Optional[List[str]] = None,
+                     match_all_subtopics: bool = False, **page) -> bytes:
+        """
+        JSON body for several companies at once:
+
+            {"companies": {company: [...]}, "totals": {company: n}, "unknown": [names],
+             "aggregated": [{...question, "companies": [...], "company_count": n, "total_company_count": n}]}
+
+        Each per-company set is sliced out of the encoded_query body (so it is
+        cached and reused as bytes); only the aggregated view is encoded here.
+        Names are resolved like single-company requests.
+        """
+        filters = dict(difficulties=difficulties, subtopics=subtopics, match_all_subtopics=match_all_subtopics)
+        parts, totals, unknown, companies = [], {}, [], []
+        for name in company_names:
+            company = self.resolve(name)
+            if company in totals:
+                continue
+            result = self.encoded_query(company, **filters, **page) if company is not None else None
+            if result is None:
+                unknown.append(name)
+            else:
+                total, body = result
+                key = dumps(company)
+                # body is {"<company>":[...]}: keep the list
+                parts.append(key + b":" + body[len(key) + 2:-1])
+                totals[company] = total
+                companies.append(company)
+        store = self.store
+        aggregated = [
+            {**q.to_dict(), "companies": list(asked_by), "company_count": len(asked_by),
+             "total_company_count": store.company_counts[q.id]}
+            for q, asked_by in store.aggregate(companies, limit=aggregate_limit, **filters)
+        ]
+        return (b'{"companies":{' + b",".join(parts) + b'},"totals":' + dumps(totals)
+                + b',"unknown":' + dumps(unknown) + b',"aggregated":' + dumps(aggregated) + b"}")
+
+    def rank(self, query: str, k: int = 10, company_name: Optional[str] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        The k questions most relevant to `query` (e.g. a job description), best first.
+
+        Uses the memory-mapped TF-IDF index over all unique questions; with a
+        company only that company's questions are considered.
+        """
+        store = self.store
+        index = self._rank_index
+        if index is None:
+            index = self._rank_index = load_dsa_index(store.questions)
+        rows = None
+        if company_name is not None:
+            ids = store.company_question_ids(company_name.lower())
+            if ids is None:
+                return []
+            rows = np.frombuffer(ids, dtype=np.uint16).astype(np.intp)
+        return [(store.questions[i].to_dict(), score) for i, score in index.top_k(query, k, rows)]
+
+    def search(self, query: str, k: int = 10,
+               company_name: Optional[str] = None) -> List[Tuple[Dict[str, Any], float, float]]:
+        """
+        BM25 keyword matches for `query`, best first, as (question, score, coverage).
+
+        The inverted index over all unique questions is built on first use; with
+        a company only that company's questions are considered.
+        """
+        store = self.store
+        index = self._search_index
+        if index is None:
+            index = self._search_index = BM25Index([dsa_text(q) for q in store.questions])
+        rows = None
+        if company_name is not None:
+            ids = store.company_question_ids(company_name.lower())
+            if ids is None:
+                return []
+            rows = np.frombuffer(ids, dtype=np.uint16).astype(np.intp)
+        return [(store.questions[i].to_dict(), score, coverage) for i, score, coverage in index.search(query, k, rows)]
+
+
+_repository: Optional[DSARepository] = None
+
+
+def get_repository() -> DSARepository:
+    """Return the process-wide repository, loading dsa.json on first use."""
+    global _repository
+    if _repository is None:
+        repository = DSARepository()
+        repository.load()
+        _repository = repository
+    return _repository
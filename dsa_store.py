@@ -0,0 +1,349 @@
+"""
+Compact, deduplicated storage for the company -> DSA questions data.
+
+dsa.json repeats the full question record for every company that asks it. The
+CompactDSAStore keeps each unique question once as a __slots__ record (with
+interned difficulty/subtopic strings) and gives each company an array of ids.
+Difficulty, subtopic and company membership are precomputed as bitsets so that
+filtered, sorted and paginated queries never scan the raw records.
+
+Run this module to convert dsa.json into the compact on-disk format once:
+
+    python dsa_store.py dsa.json dsa_compact.json
+"""
+import sys
+import json
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+COMPACT_FORMAT_VERSION = 1
+
+DIFFICULTY_ORDER = {"easy": 0, "medium": 1, "hard": 2}
+
+SORT_KEYS = {
+    "question_no": lambda q: (q.question_no, q.id),
+    "question_name": lambda q: (q.question_name.lower(), q.id),
+    "difficulty": lambda q: (DIFFICULTY_ORDER.get(q.difficulty.lower(), len(DIFFICULTY_ORDER)), q.question_no, q.id),
+}
+
+
+class Question:
+    """A single unique DSA question."""
+
+    __slots__ = ("id", "question_no", "question_name", "difficulty", "subtopics", "question_link")
+
+    def __init__(self, id: int, question_no: int, question_name: str, difficulty: str,
+                 subtopics: Tuple[str, ...], question_link: str):
+        self.id = id
+        self.question_no = question_no
+        self.question_name = question_name
+        self.difficulty = difficulty
+        self.subtopics = subtopics
+        self.question_link = question_link
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record in the same shape as the entries of dsa.json."""
+        return {
+            "question_no": self.question_no,
+            "question_name": self.question_name,
+            "difficulty": self.difficulty,
+            "subtopics": list(self.subtopics),
+            "question_link": self.question_link,
+        }
+
+
+class CompactDSAStore:
+    """
+    Immutable store of unique questions plus per-company arrays of question ids.
+
+    Build it with `from_raw` (the dsa.json layout) or `from_compact` (the layout
+    written by `to_compact`); `load` accepts either file.
+    """
+
+    def __init__(self, questions: Tuple[Question, ...], companies: Mapping[str, array]):
+        self.questions = questions
+        self.companies = companies
+        # Inverted index: the companies asking each question, in company order
+        asked_by: List[List[str]] = [[] for _ in questions]
+        for company, ids in companies.items():
+            for i in ids:
+                asked_by[i].append(company)
+        self.question_companies: Tuple[Tuple[str, ...], ...] = tuple(map(tuple, asked_by))
+        self.company_counts = array("H", map(len, asked_by))
+        # One index per ordering: bit i of every bitset is the i-th question in that order
+        self._indexes = {None: _BitsetIndex(questions, companies, tuple(range(len(questions))))}
+        for sort_by, key in SORT_KEYS.items():
+            order = tuple(q.id for q in sorted(questions, key=key))
+            self._indexes[sort_by] = _BitsetIndex(questions, companies, order)
+
+    @classmethod
+    def from_raw(cls, dsa_data: Dict[str, List[Dict[str, Any]]]) -> "CompactDSAStore":
+        builder = _StoreBuilder()
+        companies = {}
+        for company, entries in dsa_data.items():
+            companies[company.lower()] = array("H", (
+                builder.add(
+                    entry["question_no"],
+                    entry["question_name"],
+                    entry["difficulty"],
+                    entry.get("subtopics", []),
+                    entry["question_link"],
+                )
+                for entry in entries
+            ))
+        return cls(tuple(builder.questions), MappingProxyType(companies))
+
+    @classmethod
+    def from_compact(cls, data: Dict[str, Any]) -> "CompactDSAStore":
+        if data.get("version") != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact DSA format version: {data.get('version')}")
+        builder = _StoreBuilder()
+        difficulties = data["difficulties"]
+        subtopics = data["subtopics"]
+        for question_no, question_name, difficulty, topic_ids, question_link in data["questions"]:
+            builder.add(
+                question_no,
+                question_name,
+                difficulties[difficulty],
+                [subtopics[i] for i in topic_ids],
+                question_link,
+            )
+        companies = {
+            company: array("H", ids) for company, ids in data["companies"].items()
+        }
+        return cls(tuple(builder.questions), MappingProxyType(companies))
+
+    @classmethod
+    def load(cls, path: str) -> "CompactDSAStore":
+        """Load either the raw dsa.json layout or the compact layout from `path`."""
+        with open(path, "r") as file:
+            data = json.load(file)
+        if "version" in data and "questions" in data and "companies" in data:
+            return cls.from_compact(data)
+        return cls.from_raw(data)
+
+    def to_compact(self) -> Dict[str, Any]:
+        """Serialize to the compact layout with difficulties/subtopics as string tables."""
+        difficulties: Dict[str, int] = {}
+        subtopics: Dict[str, int] = {}
+        rows = []
+        for q in self.questions:
+            difficulty = difficulties.setdefault(q.difficulty, len(difficulties))
+            topic_ids = [subtopics.setdefault(t, len(subtopics)) for t in q.subtopics]
+            rows.append([q.question_no, q.question_name, difficulty, topic_ids, q.question_link])
+        return {
+            "version": COMPACT_FORMAT_VERSION,
+            "difficulties": list(difficulties),
+            "subtopics": list(subtopics),
+            "questions": rows,
+            "companies": {company: ids.tolist() for company, ids in self.companies.items()},
+        }
+
+    def company_question_ids(self, company_name: str) -> Optional[array]:
+        return self.companies.get(company_name)
+
+    def company_questions(self, company_name: str) -> Optional[List[Question]]:
+        ids = self.companies.get(company_name)
+        if ids is None:
+            return None
+        questions = self.questions
+        return [questions[i] for i in ids]
+
+    def query(self, company_name: str, difficulties: Optional[Iterable[str]] = None,
+              subtopics: Optional[Iterable[str]] = None, match_all_subtopics: bool = False,
+              sort_by: Optional[str] = None, descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> Optional[Tuple[int, List[Question]]]:
+        """
+        Filter, sort and paginate a company's questions using the bitset indexes.
+
+        Args:
+            company_name: Lowercased company key
+            difficulties: Keep questions with any of these difficulties (case-insensitive)
+            subtopics: Keep questions tagged with any (or all) of these subtopics
+            match_all_subtopics: Require every subtopic instead of any of them
+            sort_by: None for the company's own order, or one of SORT_KEYS
+            descending: Reverse the ordering
+            offset: Number of matching questions to skip
+            limit: Maximum number of questions to return (None for all)
+
+        Returns:
+            (total number of matches, questions on the requested page), or None
+            if the company is unknown
+        """
+        if sort_by not in self._indexes:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        index = self._indexes[sort_by]
+        mask = self._filter_mask(index, company_name, difficulties, subtopics, match_all_subtopics)
+        if mask is None:
+            return None
+
+        total = mask.bit_count()
+        if limit is None:
+            limit = total
+        questions = self.questions
+        if sort_by is None:
+            # Keep the company's own ordering; stop as soon as the page is full
+            ids = self.companies[company_name]
+            if descending:
+                ids = reversed(ids)
+            page = []
+            skipped = 0
+            for i in ids:
+                if len(page) >= limit:
+                    break
+                if mask >> i & 1:
+                    if skipped < offset:
+                        skipped += 1
+                    else:
+                        page.append(questions[i])
+            return total, page
+        positions = _iter_bits(mask, descending)
+        order = index.order
+        page = []
+        for n, position in enumerate(positions):
+            if len(page) >= limit:
+                break
+            if n >= offset:
+                page.append(questions[order[position]])
+        return total, page
+
+    @staticmethod
+    def _filter_mask(index: "_BitsetIndex", company_name: str, difficulties: Optional[Iterable[str]],
+                     subtopics: Optional[Iterable[str]], match_all_subtopics: bool) -> Optional[int]:
+        mask = index.by_company.get(company_name)
+        if mask is None:
+            return None
+        if difficulties:
+            mask &= index.any_of(index.by_difficulty, difficulties)
+        if subtopics:
+            if match_all_subtopics:
+                mask &= index.all_of(index.by_subtopic, subtopics)
+            else:
+                mask &= index.any_of(index.by_subtopic, subtopics)
+        return mask
+
+    def aggregate(self, company_names: Iterable[str], difficulties: Optional[Iterable[str]] = None,
+                  subtopics: Optional[Iterable[str]] = None, match_all_subtopics: bool = False,
+                  limit: Optional[int] = None) -> List[Tuple[Question, Tuple[str, ...]]]:
+        """
+        Questions asked by any of the given companies, deduplicated and ranked by
+        how many of them ask it (ties: by how many companies overall ask it).
+
+        The filtered bitsets of the companies are OR-ed, and the companies asking
+        each remaining question come from the precomputed inverted index.
+
+        Returns:
+            [(question, requested companies that ask it)], best first; unknown
+            companies are ignored
+        """
+        index = self._indexes[None]
+        requested = set()
+        union = 0
+        for company in company_names:
+            mask = self._filter_mask(index, company, difficulties, subtopics, match_all_subtopics)
+            if mask is not None:
+                requested.add(company)
+                union |= mask
+        counts = self.company_counts
+        ranked = [(i, tuple(c for c in self.question_companies[i] if c in requested)) for i in _iter_bits(union)]
+        ranked.sort(key=lambda r: (-len(r[1]), -counts[r[0]], r[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        questions = self.questions
+        return [(questions[i], asked_by) for i, asked_by in ranked]
+
+
+class _BitsetIndex:
+    """Company/difficulty/subtopic bitsets where bit i is the question at order[i]."""
+
+    def __init__(self, questions: Tuple[Question, ...], companies: Mapping[str, array],
+                 order: Tuple[int, ...]):
+        self.order = order
+        position = [0] * len(order)
+        self.by_difficulty: Dict[str, int] = {}
+        self.by_subtopic: Dict[str, int] = {}
+        for i, question_id in enumerate(order):
+            position[question_id] = i
+            q = questions[question_id]
+            bit = 1 << i
+            difficulty = q.difficulty.lower()
+            self.by_difficulty[difficulty] = self.by_difficulty.get(difficulty, 0) | bit
+            for topic in q.subtopics:
+                topic = topic.lower()
+                self.by_subtopic[topic] = self.by_subtopic.get(topic, 0) | bit
+        self.by_company: Dict[str, int] = {}
+        for company, ids in companies.items():
+            bits = 0
+            for question_id in ids:
+                bits |= 1 << position[question_id]
+            self.by_company[company] = bits
+
+    @staticmethod
+    def any_of(bitsets: Dict[str, int], keys: Iterable[str]) -> int:
+        mask = 0
+        for key in keys:
+            mask |= bitsets.get(key.lower(), 0)
+        return mask
+
+    @staticmethod
+    def all_of(bitsets: Dict[str, int], keys: Iterable[str]) -> int:
+        mask = -1
+        for key in keys:
+            mask &= bitsets.get(key.lower(), 0)
+        return mask
+
+
+def _iter_bits(mask: int, descending: bool = False):
+    """Yield the positions of the set bits of `mask`, lowest first unless descending."""
+    if descending:
+        while mask:
+            position = mask.bit_length() - 1
+            yield position
+            mask ^= 1 << position
+    else:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+
+class _StoreBuilder:
+    """Assigns ids to unique questions and interns their repeated strings."""
+
+    def __init__(self):
+        self.questions: List[Question] = []
+        self._ids: Dict[tuple, int] = {}
+        self._subtopics: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def add(self, question_no: int, question_name: str, difficulty: str,
+            subtopics: Iterable[str], question_link: str) -> int:
+        topics = tuple(sys.intern(t) for t in subtopics)
+        topics = self._subtopics.setdefault(topics, topics)
+        key = (question_no, question_name, difficulty, topics, question_link)
+        question_id = self._ids.get(key)
+        if question_id is None:
+            question_id = len(self.questions)
+            self._ids[key] = question_id
+            self.questions.append(Question(
+                question_id, question_no, question_name, sys.intern(difficulty), topics, question_link
+            ))
+        return question_id
+
+
+def convert(src_path: str, dst_path: str) -> CompactDSAStore:
+    """One-time conversion of a raw dsa.json file into the compact layout."""
+    store = CompactDSAStore.load(src_path)
+    with open(dst_path, "w") as file:
+        json.dump(store.to_compact(), file, separators=(",", ":"))
+    total = sum(len(ids) for ids in store.companies.values())
+    print(f"Converted {total} entries for {len(store.companies)} companies "
+          f"into {len(store.questions)} unique questions: {dst_path}")
+    return store
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python dsa_store.py <dsa.json> <dsa_compact.json>")
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
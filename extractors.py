@@ -0,0 +1,116 @@
+"""
+Question extraction from fetched source pages.
+
+Each source has an ExtractionRule: a CSS selector for the question headings and
+an optional CSS selector for the content region to search in (falling back to the
+whole page when the region isn't found). Rules are evaluated by the fastest
+available parser backend: selectolax (lexbor, C), lxml (libxml2, C) or, when
+neither is installed, BeautifulSoup restricted with a SoupStrainer.
+"""
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+from telemetry import count, span
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional fast backend
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # optional fast backend (CSS support needs the cssselect package)
+    CSSSelector = None
+
+
+class ExtractionRule(BaseModel):
+    questions: str = "h2"  # CSS selector of the question headings
+    region: Optional[str] = None  # CSS selector of the main content, whole page if None or not found
+
+
+DEFAULT_RULE = ExtractionRule()
+
+# Keyed by host; sources without an entry use DEFAULT_RULE
+SOURCE_RULES: Dict[str, ExtractionRule] = {
+    "www.geeksforgeeks.org": ExtractionRule(questions="h2", region="article"),
+    "www.interviewbit.com": ExtractionRule(questions="h2, h3", region="article, main"),
+    "www.javatpoint.com": ExtractionRule(questions="h2, h3", region="#city, main"),
+    "www.simplilearn.com": ExtractionRule(questions="h2", region="article, main"),
+    "www.educative.io": ExtractionRule(questions="h2", region="article, main"),
+}
+
+
+def rule_for(url: str) -> ExtractionRule:
+    return SOURCE_RULES.get(urlsplit(url).netloc, DEFAULT_RULE)
+
+
+def _extract_selectolax(html: str, rule: ExtractionRule) -> List[str]:
+    tree = LexborHTMLParser(html)
+    root = (tree.css_first(rule.region) if rule.region else None) or tree.root
+    if root is None:
+        return []
+    return [node.text(deep=True).strip() for node in root.css(rule.questions)]
+
+
+@lru_cache(maxsize=None)
+def _css(selector: str):
+    return CSSSelector(selector)
+
+
+def _extract_lxml(html: str, rule: ExtractionRule) -> List[str]:
+    if not html.strip():
+        return []
+    root = lxml.html.fromstring(html)
+    if rule.region:
+        regions = _css(rule.region)(root)
+        if regions:
+            root = regions[0]
+    return [node.text_content().strip() for node in _css(rule.questions)(root)]
+
+
+def _extract_soup(html: str, rule: ExtractionRule) -> List[str]:
+    from bs4 import BeautifulSoup, SoupStrainer
+    parse_only = None
+    if rule.region is None and rule.questions.replace(",", " ").replace(" ", "").isalnum():
+        # Plain tag selectors: only build tree nodes for the tags we collect
+        parse_only = SoupStrainer([t.strip() for t in rule.questions.split(",")])
+    soup = BeautifulSoup(html, 'html.parser', parse_only=parse_only)
+    root = (soup.select_one(rule.region) if rule.region else None) or soup
+    return [node.get_text().strip() for node in root.select(rule.questions)]
+
+
+BACKENDS: Dict[str, Callable[[str, ExtractionRule], List[str]]] = {"html.parser": _extract_soup}
+if CSSSelector is not None:
+    BACKENDS["lxml"] = _extract_lxml
+if LexborHTMLParser is not None:
+    BACKENDS["selectolax"] = _extract_selectolax
+
+
+def default_backend() -> str:
+    """EXTRACTOR_BACKEND if set, otherwise the fastest installed backend."""
+    name = os.getenv("EXTRACTOR_BACKEND")
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"Extractor backend {name!r} is not available (have {sorted(BACKENDS)})")
+        return name
+    for name in ("selectolax", "lxml", "html.parser"):
+        if name in BACKENDS:
+            return name
+
+
+def extract_questions(url: str, html: str, backend: Optional[str] = None) -> List[Dict[str, str]]:
+    """Extract candidate questions from a fetched page using the source's rule."""
+    source = urlsplit(url).hostname or url
+    backend = backend or default_backend()
+    with span("extract", labels={"source": source}, backend=backend) as attrs:
+        texts = BACKENDS[backend](html, rule_for(url))
+        q_type = 'DSA' if 'dsa' in url.lower() else 'HR'
+        questions = [{'question': text, 'link': url, 'type': q_type} for text in texts if text]
+        attrs["questions"] = len(questions)
+    count("questions_extracted", len(questions), source=source)
+    return questions
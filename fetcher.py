@@ -0,0 +1,198 @@
+"""
+Concurrent fetching of the interview-question source pages.
+
+All sources are requested in parallel with httpx. A per-host semaphore keeps us
+polite to any single site, and an overall deadline bounds the wall time of a
+request: sources that haven't answered by then are reported as failed and the
+pages that did arrive are still used. When an HTTPCache is passed, fresh pages
+are served from disk and stale ones are revalidated with conditional requests;
+the cache's SQLite reads and writes run in worker threads, off the event loop.
+When a SourceRegistry is passed (see source_health.py), each source gets an
+adaptive timeout from its recent latencies, and sources whose circuit is open
+are skipped (served stale from the cache if possible) without a request.
+"""
+import os
+import time
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from pydantic import BaseModel
+
+from http_cache import CachedResponse, HTTPCache
+from source_health import SourceRegistry
+from telemetry import count, span
+
+SOURCE_URLS = [
+    "https://www.geeksforgeeks.org/top-100-data-structure-and-algorithms-dsa-interview-questions-topic-wise/",
+    "https://www.indeed.com/career-advice/interviewing/hr-interview-questions",
+    "https://www.interviewbit.com/hr-interview-questions/",
+    "https://leetcode.com/discuss/general-discussion/459219/blind-75-leetcode-questions",
+    "https://www.javatpoint.com/data-structure-interview-questions",
+    "https://www.hackerrank.com/interview/interview-preparation-kit",
+    "https://www.careerride.com/Interview-Questions.aspx",
+    "https://www.toptal.com/interview-questions",
+    "https://www.simplilearn.com/tutorials/data-structure-tutorial/data-structure-interview-questions",
+    "https://www.educative.io/blog/crack-system-design-interview"
+]
+# Comma-separated replacement list, e.g. local stand-ins for load testing
+if os.getenv("SOURCE_URLS"):
+    SOURCE_URLS = [url.strip() for url in os.environ["SOURCE_URLS"].split(",") if url.strip()]
+
+DEFAULT_TIMEOUT = 10.0  # per source
+DEFAULT_DEADLINE = 12.0  # for the whole batch
+DEFAULT_PER_HOST_LIMIT = 2
+
+
+class FetchResult(BaseModel):
+    url: str
+    status_code: Optional[int] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    from_cache: bool = False
+    skipped: bool = False  # circuit open, not requested
+    fetched_at: Optional[float] = None  # when the body was downloaded (or last revalidated), epoch seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200 and self.text is not None
+
+
+def _from_cache(cached: CachedResponse, start: float) -> FetchResult:
+    return FetchResult(url=cached.url, status_code=cached.status_code, text=cached.text,
+                       elapsed=time.perf_counter() - start, from_cache=True, fetched_at=cached.fetched_at)
+
+
+async def _fetch_one(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore,
+                     timeout: float, cache: Optional[HTTPCache] = None,
+                     health: Optional[SourceRegistry] = None) -> FetchResult:
+    source = urlsplit(url).hostname or url
+    with span("fetch", labels={"source": source}, url=url) as attrs:
+        result = await _fetch(client, url, semaphore, timeout, cache, health)
+        attrs.update(status_code=result.status_code, from_cache=result.from_cache, error=result.error,
+                     skipped=result.skipped)
+    outcome = "cache" if result.from_cache else "ok" if result.ok else "skipped" if result.skipped else "error"
+    count("fetches", source=source, outcome=outcome)
+    return result
+
+
+async def _fetch(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore,
+                 timeout: float, cache: Optional[HTTPCache] = None,
+                 health: Optional[SourceRegistry] = None) -> FetchResult:
+    start = time.perf_counter()
+    cached = await asyncio.to_thread(cache.get, url) if cache is not None else None
+    if cached is not None and (cache.offline or cached.is_fresh(cache.ttl)):
+        cache.record("hits")
+        return _from_cache(cached, start)
+    if cache is not None and cache.offline:
+        cache.record("misses")
+        return FetchResult(url=url, error="Offline mode and page is not cached")
+
+    if health is not None:
+        allowed, _ = health.allow(url)
+        if not allowed:
+            if cached is not None:
+                cache.record("stale_served")
+                return _from_cache(cached, start)
+            return FetchResult(url=url, error="Circuit open: source is failing, skipped", skipped=True)
+        timeout = health.timeout_for(url, timeout)
+
+    request_start = start
+    try:
+        async with semaphore:
+            request_start = time.perf_counter()
+            headers = cached.validators() if cached is not None else None
+            response = await client.get(url, timeout=timeout, headers=headers)
+    except asyncio.CancelledError:
+        if health is not None:
+            # Also releases a half-open probe that was cancelled
+            health.record(url, False, time.perf_counter() - request_start, "Cancelled at the batch deadline")
+        raise
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if health is not None:
+            health.record(url, False, time.perf_counter() - request_start, error,
+                          timed_out=isinstance(e, httpx.TimeoutException))
+        if cached is not None:
+            # Better a week-old page than nothing
+            cache.record("stale_served")
+            return _from_cache(cached, start)
+        return FetchResult(url=url, error=error, elapsed=time.perf_counter() - start)
+    if health is not None:
+        ok = response.status_code == 200 or (response.status_code == 304 and cached is not None)
+        health.record(url, ok, time.perf_counter() - request_start,
+                      None if ok else f"Status Code: {response.status_code}")
+    count("bytes_downloaded", len(response.content), source=urlsplit(url).hostname or url)
+
+    fetched_at = time.time()
+    if response.status_code == 304 and cached is not None:
+        await asyncio.to_thread(cache.mark_revalidated, url, fetched_at)
+        return _from_cache(cached.model_copy(update={"fetched_at": fetched_at}), start)
+    if cache is not None:
+        cache.record("misses")
+        if response.status_code == 200:
+            # Writes the whole page and may evict; keep it off the event loop
+            await asyncio.to_thread(cache.put, url, response.status_code, response.text,
+                                    etag=response.headers.get("ETag"),
+                                    last_modified=response.headers.get("Last-Modified"),
+                                    fetched_at=fetched_at)
+    return FetchResult(
+        url=url,
+        status_code=response.status_code,
+        text=response.text if response.status_code == 200 else None,
+        elapsed=time.perf_counter() - start,
+        fetched_at=fetched_at
+    )
+
+
+async def fetch_as_completed(urls: List[str], timeout: float = DEFAULT_TIMEOUT,
+                             deadline: float = DEFAULT_DEADLINE,
+                             per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                             client: Optional[httpx.AsyncClient] = None,
+                             cache: Optional[HTTPCache] = None,
+                             health: Optional[SourceRegistry] = None) -> AsyncIterator[FetchResult]:
+    """
+    Fetch `urls` concurrently and yield each result as soon as it is available.
+
+    Sources still running when `deadline` seconds have passed are cancelled and
+    yielded as failed results, so callers always get one result per URL.
+    """
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(follow_redirects=True, headers={"User-Agent": "Mozilla/5.0"})
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+    tasks = {}
+    for url in urls:
+        host = urlsplit(url).netloc
+        semaphore = semaphores.setdefault(host, asyncio.Semaphore(per_host_limit))
+        tasks[asyncio.ensure_future(_fetch_one(client, url, semaphore, timeout, cache, health))] = url
+
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = stop_at - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+        for task in pending:
+            task.cancel()
+            yield FetchResult(url=tasks[task], error=f"Deadline of {deadline}s exceeded", elapsed=deadline)
+    finally:
+        for task in pending:
+            task.cancel()
+        if own_client:
+            await client.aclose()
+
+
+async def fetch_all(urls: List[str], **kwargs) -> List[FetchResult]:
+    """Fetch `urls` concurrently (see fetch_as_completed) and return results in input order."""
+    results = {}
+    async for result in fetch_as_completed(urls, **kwargs):
+        results[result.url] = result
+    return [results[url] for url in urls]
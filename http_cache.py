@@ -0,0 +1,159 @@
+"""
+Persistent on-disk HTTP response cache for the scraped source pages.
+
+Responses are stored in SQLite keyed by URL. An entry is served directly while
+it is younger than `ttl`; after that it is revalidated with If-None-Match /
+If-Modified-Since, so an unchanged page costs a 304 instead of a download. The
+total body size is capped and the least recently used entries are evicted. In
+offline mode only cached pages are served and the network is never touched.
+
+The methods block on SQLite and are thread-safe; async callers run get, put
+and mark_revalidated with asyncio.to_thread.
+"""
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "HTTP_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http_cache.sqlite3")
+)
+DEFAULT_TTL = float(os.getenv("HTTP_CACHE_TTL", 24 * 3600))
+DEFAULT_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+class CachedResponse(BaseModel):
+    url: str
+    status_code: int
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """SQLite-backed URL -> response cache with TTL, revalidation and LRU eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0, "stale_served": 0}
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the stored response for `url` (fresh or not) and mark it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, body, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        status_code, body, etag, last_modified, fetched_at = row
+        return CachedResponse(url=url, status_code=status_code, text=body, etag=etag,
+                              last_modified=last_modified, fetched_at=fetched_at)
+
+    def put(self, url: str, status_code: int, text: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, fetched_at: Optional[float] = None) -> None:
+        now = time.time() if fetched_at is None else fetched_at
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status_code, text, etag, last_modified, now, now, size)
+            )
+            self.stats["stores"] += 1
+            self._evict()
+
+    def mark_revalidated(self, url: str, fetched_at: Optional[float] = None) -> None:
+        """Restart the TTL of an entry after the origin answered 304 Not Modified."""
+        now = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+            self.stats["revalidated"] += 1
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            total -= row[1]
+            self.stats["evictions"] += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """Counters plus current size, for the admin endpoint."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats.update({
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "offline": self.offline,
+            "hit_ratio": (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0,
+        })
+        return stats
+
+
+_http_cache: Optional[HTTPCache] = None
+
+
+def get_http_cache() -> HTTPCache:
+    """Return the process-wide cache; set FETCH_OFFLINE=1 to serve only cached pages."""
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HTTPCache(offline=os.getenv("FETCH_OFFLINE", "").lower() in ("1", "true", "yes"))
+    return _http_cache
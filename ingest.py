@@ -0,0 +1,93 @@
+"""
+Offline ingestion of the interview-question sources into the local corpus.
+
+    python ingest.py                 # scrape once and publish a new corpus version
+    python ingest.py --every 86400   # keep re-ingesting on a schedule
+    python ingest.py --offline       # rebuild from the HTTP cache only
+    python ingest.py --save-html benchmarks/fixtures   # also keep the raw pages
+
+The API's fetcher node serves questions from the published corpus, so running
+this (e.g. from cron) takes scraping and HTML parsing off the request path.
+"""
+import os
+import re
+import sys
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from fetcher import SOURCE_URLS, fetch_all
+from http_cache import get_http_cache
+from question_corpus import DEFAULT_CORPUS_DIR, write_version
+from extractors import extract_questions
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def dedup_key(question: str) -> str:
+    return _WHITESPACE.sub(" ", question).strip().rstrip("?.:!").lower()
+
+
+def fixture_name(url: str) -> str:
+    parts = urlsplit(url)
+    return re.sub(r"[^A-Za-z0-9]+", "_", parts.netloc + parts.path).strip("_") + ".html"
+
+
+async def scrape(urls: List[str], save_html: Optional[str] = None):
+    """Fetch and extract every source; return (deduplicated questions, per-source report)."""
+    questions: List[Dict[str, str]] = []
+    seen = set()
+    sources = {}
+    for result in await fetch_all(urls, cache=get_http_cache()):
+        if not result.ok:
+            sources[result.url] = {"status_code": result.status_code, "error": result.error, "questions": 0}
+            print(f"Ingest: Failed to fetch {result.url}: {result.error or result.status_code}")
+            continue
+        if save_html:
+            os.makedirs(save_html, exist_ok=True)
+            with open(os.path.join(save_html, fixture_name(result.url)), "w") as file:
+                file.write(result.text)
+        extracted = extract_questions(result.url, result.text)
+        added = 0
+        for q in extracted:
+            key = dedup_key(q["question"])
+            if key not in seen:
+                seen.add(key)
+                questions.append(q)
+                added += 1
+        sources[result.url] = {"status_code": result.status_code, "extracted": len(extracted), "questions": added}
+    return questions, sources
+
+
+def ingest(corpus_dir: str, urls: List[str], save_html: Optional[str] = None) -> bool:
+    questions, sources = asyncio.run(scrape(urls, save_html))
+    if not questions:
+        # Don't replace a good corpus with an empty one when every source failed
+        print("Ingest: No questions extracted, keeping the current corpus version.")
+        return False
+    path = write_version(corpus_dir, questions, sources)
+    print(f"Ingest: Published {len(questions)} questions from "
+          f"{sum(1 for s in sources.values() if s['questions'])}/{len(urls)} sources to {path}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape interview-question sources into the local corpus.")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--every", type=float, default=None, help="re-ingest every N seconds")
+    parser.add_argument("--offline", action="store_true", help="only use pages already in the HTTP cache")
+    parser.add_argument("--save-html", default=None, help="also save the raw pages here (benchmark fixtures)")
+    args = parser.parse_args()
+
+    get_http_cache().offline = args.offline
+    while True:
+        ok = ingest(args.corpus_dir, SOURCE_URLS, args.save_html)
+        if args.every is None:
+            sys.exit(0 if ok else 1)
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Bounded background job queue for interview-question generation.
+
+    job = queue.submit(lambda: run_interview_pipeline(request))   # QueueFullError when saturated
+    queue.get(job.id).to_dict()                                    # poll
+    async for status in queue.watch(job.id): ...                   # stream status changes
+
+A fixed number of worker tasks pull jobs from a FIFO of at most `max_depth`
+waiting jobs, so excess load waits in line (or is rejected right away with
+QueueFullError, which the API turns into a 429) instead of every request
+running at once and all of them getting slow. Each job gets `timeout` seconds
+of run time. Finished jobs are kept for `retention` seconds for polling.
+Queue-wait and run-time histograms go to the telemetry registry.
+
+Jobs run in the process that accepted them, but every status change is also
+written to a shared SQLite store (JOB_STORE_PATH), so with several uvicorn
+workers a poll or stream landing on another worker still finds the job:
+lookup() falls back to the store and watch() polls it. Set JOB_STORE_PATH to
+an empty string to keep jobs in process memory only, which is correct for a
+single worker only.
+"""
+import os
+import json
+import math
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from telemetry import count, registry
+
+DEFAULT_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+DEFAULT_MAX_DEPTH = int(os.getenv("JOB_QUEUE_DEPTH", 64))
+DEFAULT_TIMEOUT = float(os.getenv("JOB_TIMEOUT", 180))
+DEFAULT_RETENTION = float(os.getenv("JOB_RETENTION", 600))
+DEFAULT_MAX_RETAINED = int(os.getenv("JOB_MAX_RETAINED", 1024))
+DEFAULT_STORE_PATH = os.getenv(
+    "JOB_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "jobs.sqlite3")
+)
+DEFAULT_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 0.5))  # watching a job of another worker
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, TIMED_OUT = "queued", "running", "succeeded", "failed", "timed_out"
+FINISHED = (SUCCEEDED, FAILED, TIMED_OUT)
+
+
+class QueueFullError(Exception):
+    """The queue is at max_depth; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, compute: Callable[[], Awaitable[Any]]):
+        self.id = uuid.uuid4().hex
+        self.status = QUEUED
+        self.compute = compute
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        # Wake everyone watching and arm a fresh event for the next change
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "Job":
+        """A read-only view of a job stored by another worker (see _JobStore)."""
+        job = cls(None)
+        job.id, job.status, job.error = data["job_id"], data["status"], data.get("error")
+        job.created_at, job.started_at, job.finished_at = data["created_at"], data["started_at"], data["finished_at"]
+        job.result = data.get("result")
+        return job
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if include_result and self.status == SUCCEEDED:
+            data["result"] = self.result
+        return data
+
+
+class _JobStore:
+    """Shared SQLite job id -> job dict, so every worker process can answer polls."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data, expires_at FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def put(self, data: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)", (data["job_id"], json.dumps(data), expires_at)
+            )
+            self._conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+
+
+class JobQueue:
+    """FIFO of jobs drained by a fixed pool of worker tasks on the running event loop."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_depth: int = DEFAULT_MAX_DEPTH,
+                 timeout: float = DEFAULT_TIMEOUT, retention: float = DEFAULT_RETENTION,
+                 max_retained: int = DEFAULT_MAX_RETAINED, store_path: Optional[str] = DEFAULT_STORE_PATH,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.workers = workers
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.retention = retention
+        self.max_retained = max_retained
+        self.poll_interval = poll_interval
+        self._store = _JobStore(store_path) if store_path else None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = 0
+        self._run_seconds = 0.0
+        self.stats = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "timed_out": 0}
+
+    def start(self) -> None:
+        """Start the workers on the running loop (again, if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up, from the mean run time so far."""
+        finished = self.stats["succeeded"] + self.stats["failed"] + self.stats["timed_out"]
+        mean_run = self._run_seconds / finished if finished else 1.0
+        return max(1, math.ceil(mean_run * self.max_depth / self.workers))
+
+    def submit(self, compute: Callable[[], Awaitable[Any]]) -> Job:
+        """Queue `compute()` to run on the pool; raises QueueFullError instead of waiting for room."""
+        self.start()
+        if self._queue.full():
+            self.stats["rejected"] += 1
+            count("jobs", outcome="rejected")
+            raise QueueFullError(self.retry_after())
+        self._prune()
+        job = Job(compute)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self.stats["submitted"] += 1
+        self._persist(job)  # a small row, before any other worker can be asked about it
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job of this process."""
+        return self._jobs.get(job_id)
+
+    async def lookup(self, job_id: str) -> Optional[Job]:
+        """A job of this process, or a stored view of one running in another worker."""
+        job = self._jobs.get(job_id)
+        if job is None and self._store is not None:
+            data = await asyncio.to_thread(self._store.get, job_id)
+            job = Job.restore(data) if data is not None else None
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[Job]:
+        """Yield the job now and after every status change until it has finished."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            async for job in self._watch_stored(job_id):
+                yield job
+            return
+        while True:
+            changed = job._changed
+            yield job
+            if job.status in FINISHED:
+                return
+            await changed.wait()
+
+    async def _watch_stored(self, job_id: str) -> AsyncIterator[Job]:
+        """watch() for a job of another worker: poll the store for status changes."""
+        status = None
+        while self._store is not None:
+            data = await asyncio.to_thread(self._store.get, job_id)
+            if data is None:
+                return
+            if data["status"] != status:
+                status = data["status"]
+                yield Job.restore(data)
+                if status in FINISHED:
+                    return
+            await asyncio.sleep(self.poll_interval)
+
+    def _persist(self, job: Job) -> None:
+        if self._store is not None:
+            # Unfinished jobs are kept long enough to run; finished ones for the retention period
+            ttl = self.retention if job.status in FINISHED else self.retention + self.timeout
+            self._store.put(job.to_dict(), time.time() + ttl)
+
+    def _prune(self) -> None:
+        """Drop finished jobs past their retention, and the oldest ones beyond max_retained."""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            expired = job.finished_at is not None and job.finished_at + self.retention <= now
+            if expired or (len(self._jobs) > self.max_retained and job.status in FINISHED):
+                del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception as e:
+                # Bookkeeping bugs must not cost the pool a worker
+                print(f"Job Queue: Worker error on job {job.id}: {type(e).__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.started_at = time.time()
+        registry.observe("job_queue_wait_seconds", job.started_at - job.created_at)
+        job._set_status(RUNNING)
+        await asyncio.to_thread(self._persist, job)
+        self._running += 1
+        start = time.perf_counter()
+        try:
+            job.result = await asyncio.wait_for(job.compute(), self.timeout)
+            status = SUCCEEDED
+        except asyncio.TimeoutError:
+            job.error = f"Job exceeded its {self.timeout:g}s timeout"
+            status = TIMED_OUT
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # The worker itself is being stopped
+                job.error = "Job queue stopped"
+                job.finished_at = time.time()
+                job._set_status(FAILED)
+                self._persist(job)
+                raise
+            # Something the job awaited was cancelled under it; that fails the job, not the worker
+            job.error = "Job was cancelled"
+            status = FAILED
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+        finally:
+            self._running -= 1
+        duration = time.perf_counter() - start
+        self._run_seconds += duration
+        registry.observe("job_run_seconds", duration, {"status": status})
+        count("jobs", outcome=status)
+        self.stats[status] += 1
+        job.compute = None
+        job.finished_at = time.time()
+        job._set_status(status)
+        # The result can be large; write it off the event loop
+        await asyncio.to_thread(self._persist, job)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "workers_alive": sum(not task.done() for task in self._tasks),
+            "max_depth": self.max_depth,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "retained": len(self._jobs),
+        }
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
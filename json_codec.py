@@ -0,0 +1,26 @@
+"""
+JSON encoding for API responses: orjson when it is installed, the standard
+library otherwise. Either way the output is compact UTF-8 bytes.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps(); return it directly to also skip FastAPI's jsonable_encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,57 @@
+"""
+Incremental extraction of list items from a JSON document that arrives in chunks.
+
+Used to turn a streamed LLM completion such as
+    {"questions": [{"question": ...}, {"question": ...}]}
+into individual question objects as soon as each one is complete.
+"""
+import json
+from typing import Any, Dict, List
+
+
+class JSONItemStream:
+    """
+    Feed text chunks; get back every object that sits directly inside an array,
+    as soon as its closing brace arrives. Text outside the JSON (e.g. markdown
+    code fences around it) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        items = []
+        for ch in chunk:
+            if self._item_start is not None:
+                self._buffer.append(ch)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = bool(self._stack)
+            elif ch in "{[":
+                if ch == "{" and self._item_start is None and self._stack and self._stack[-1] == "[":
+                    self._item_start = len(self._stack)
+                    self._buffer = ["{"]
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._item_start == len(self._stack):
+                    try:
+                        item = json.loads("".join(self._buffer))
+                        if isinstance(item, dict):
+                            items.append(item)
+                    except ValueError:
+                        pass
+                    self._item_start = None
+                    self._buffer = []
+        return items
@@ -0,0 +1,244 @@
+"""
+Shared execution layer for the Groq chat completions used by the pipeline.
+
+One AsyncGroq client (and its pooled HTTP connections) is reused by every
+request. Calls go through a process-wide concurrency cap, are retried with
+exponential backoff on rate limits, connection errors and 5xx responses, and
+are bounded by a per-request deadline; streamed completions (stream_completion)
+go through the same cap, retries and deadline. Latencies, retries and fallbacks are
+recorded so they can be reported on the admin endpoint.
+
+Set GROQ_BASE_URL to point the client at a local fake server for testing.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+import httpx
+
+from telemetry import count, span
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+DEFAULT_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+DEFAULT_DEADLINE = float(os.getenv("LLM_DEADLINE", 45.0))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+_client = None
+_semaphore: Optional[asyncio.Semaphore] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _bind_loop() -> None:
+    """Pooled connections and the semaphore belong to one event loop; start over on a new one."""
+    global _client, _semaphore, _loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if loop is not _loop:
+        _client, _semaphore, _loop = None, None, loop
+
+
+def get_llm_client():
+    """The shared AsyncGroq client; SDK retries are disabled in favour of ours."""
+    global _client
+    _bind_loop()
+    if _client is None:
+        from groq import AsyncGroq
+        _client = AsyncGroq(
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=DEFAULT_MAX_CONCURRENCY * 2, max_keepalive_connections=DEFAULT_MAX_CONCURRENCY)
+            )
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    _bind_loop()
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+    return _semaphore
+
+
+class LLMStats:
+    """Rolling latency window plus call/retry/failure/fallback counters."""
+
+    def __init__(self, window: int = 1000):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        # requests/fallbacks count question validations, search_* the LLM refinement of /search
+        self.counters = {"calls": 0, "retries": 0, "failures": 0, "requests": 0, "fallbacks": 0,
+                         "search_requests": 0, "search_fallbacks": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.counters)
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                stats[f"latency_{name}"] = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        stats["fallback_rate"] = stats["fallbacks"] / stats["requests"] if stats["requests"] else 0.0
+        stats["search_fallback_rate"] = (stats["search_fallbacks"] / stats["search_requests"]
+                                         if stats["search_requests"] else 0.0)
+        return stats
+
+
+stats = LLMStats()
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying `error`, or None if it isn't retryable."""
+    from groq import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)) or (
+        isinstance(error, APIStatusError) and error.status_code >= 500
+    ):
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                pass
+        backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+        return max(backoff, retry_after or 0.0)
+    return None
+
+
+async def _create_json_completion(messages: List[Dict[str, str]], model: str, temperature: float, attempt: int):
+    """One attempt under the concurrency cap; returns (response, latency excluding the wait for a slot)."""
+    async with _get_semaphore():
+        start = time.perf_counter()
+        with span("llm.completion", labels={"model": model}, attempt=attempt):
+            response = await get_llm_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=temperature
+            )
+        return response, time.perf_counter() - start
+
+
+async def complete_json(messages: List[Dict[str, str]], model: str, temperature: float = 0.2,
+                        deadline: Optional[float] = None, max_retries: int = DEFAULT_MAX_RETRIES) -> Any:
+    """
+    Run one JSON-mode chat completion and return the parsed JSON.
+
+    Raises the last error once retries are exhausted, or asyncio.TimeoutError
+    when `deadline` (an event-loop time) passes first.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = deadline if deadline is not None else loop.time() + DEFAULT_DEADLINE
+    attempt = 0
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("LLM deadline exceeded")
+        try:
+            # Waiting for a slot of the concurrency cap counts against the deadline too
+            response, latency = await asyncio.wait_for(
+                _create_json_completion(messages, model, temperature, attempt), timeout=remaining
+            )
+            stats.counters["calls"] += 1
+            stats.latencies.append(latency)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                stats.counters["prompt_tokens"] += usage.prompt_tokens or 0
+                stats.counters["completion_tokens"] += usage.completion_tokens or 0
+                count("llm_tokens", usage.prompt_tokens or 0, model=model, kind="prompt")
+                count("llm_tokens", usage.completion_tokens or 0, model=model, kind="completion")
+            return json.loads(response.choices[0].message.content)
+        except asyncio.TimeoutError:
+            stats.counters["failures"] += 1
+            raise
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt >= max_retries or loop.time() + delay >= deadline:
+                stats.counters["failures"] += 1
+                raise
+            attempt += 1
+            stats.counters["retries"] += 1
+            print(f"LLM: {type(e).__name__}, retry {attempt}/{max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+async def complete_json_batch(message_batches: List[List[Dict[str, str]]], model: str,
+                              temperature: float = 0.2, deadline: Optional[float] = None) -> List[Any]:
+    """
+    Run several completions in parallel (bounded by the shared concurrency cap).
+
+    Returns one entry per batch: the parsed JSON, or the exception that batch
+    ended with, so a single failed chunk doesn't discard the others.
+    """
+    return await asyncio.gather(
+        *(complete_json(messages, model, temperature, deadline) for messages in message_batches),
+        return_exceptions=True
+    )
+
+
+async def stream_completion(messages: List[Dict[str, str]], model: str, temperature: float = 0.2,
+                            deadline: Optional[float] = None,
+                            max_retries: int = DEFAULT_MAX_RETRIES) -> AsyncIterator[str]:
+    """
+    Stream one chat completion, yielding its content deltas.
+
+    Holds a slot of the concurrency cap for the whole stream, and `deadline`
+    (an event-loop time) bounds the whole stream including the wait for the
+    slot. Opening the stream is retried like complete_json; errors after
+    content has been yielded are raised, since a retry would repeat output.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = deadline if deadline is not None else loop.time() + DEFAULT_DEADLINE
+    semaphore = _get_semaphore()
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=deadline - loop.time())
+    except asyncio.TimeoutError:
+        stats.counters["failures"] += 1
+        raise
+    try:
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                with span("llm.stream_open", labels={"model": model}, attempt=attempt):
+                    stream = await asyncio.wait_for(
+                        get_llm_client().chat.completions.create(
+                            model=model,
+                            messages=messages,
+                            temperature=temperature,
+                            stream=True
+                        ),
+                        timeout=deadline - loop.time()
+                    )
+                break
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                delay = _retry_delay(e, attempt)
+                if delay is None or attempt >= max_retries or loop.time() + delay >= deadline:
+                    raise
+                attempt += 1
+                stats.counters["retries"] += 1
+                print(f"LLM: {type(e).__name__}, retry {attempt}/{max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        chunks = stream.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline - loop.time())
+            except StopAsyncIteration:
+                break
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+        stats.counters["calls"] += 1
+        stats.latencies.append(time.perf_counter() - start)
+    except Exception:
+        stats.counters["failures"] += 1
+        raise
+    finally:
+        semaphore.release()
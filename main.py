@@ -1,11 +1,26 @@
+import os
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException
+import traceback
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+from fastapi import FastAPI, HTTPException, Query, Response
 import uvicorn
 
-from pydantic import BaseModel
-from web_agent import InterviewState, workflow, check_output_and_answer
-import json
+from pydantic import BaseModel, Field
+import llm
+from web_agent import (InterviewState, ValidationFallback, check_output_and_answer, get_interview_graph,
+                       search_questions, stream_interview_questions, warm_up)
+from dsa_repository import get_repository
+from http_cache import get_http_cache
+from fetcher import DEFAULT_TIMEOUT as FETCH_TIMEOUT
+from source_health import get_source_registry
+from result_cache import cache_key, get_result_cache, get_search_cache, search_key
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from json_codec import ORJSONResponse, dumps
+from job_queue import QueueFullError, get_job_queue
+from telemetry import TracingMiddleware, registry
 
 app = FastAPI(
     title="Candidate Evaluation API",
@@ -37,6 +52,31 @@ class InterviewRequest(BaseModel):
 
 class CompanyRequest(BaseModel):
     company_name: str
+    difficulty: Optional[List[str]] = None  # e.g. ["Easy", "Medium"]
+    subtopics: Optional[List[str]] = None
+    subtopics_match: Literal["any", "all"] = "any"
+    sort_by: Optional[Literal["question_no", "question_name", "difficulty"]] = None  # None keeps the company's order
+    order: Literal["asc", "desc"] = "asc"
+    limit: Optional[int] = Field(default=None, ge=1)
+    offset: int = Field(default=0, ge=0)
+
+
+class BulkCompanyRequest(BaseModel):
+    company_names: List[str] = Field(..., min_length=1, max_length=50)
+    difficulty: Optional[List[str]] = None
+    subtopics: Optional[List[str]] = None
+    subtopics_match: Literal["any", "all"] = "any"
+    sort_by: Optional[Literal["question_no", "question_name", "difficulty"]] = None
+    order: Literal["asc", "desc"] = "asc"
+    limit: Optional[int] = Field(default=None, ge=1)  # per company
+    aggregate_limit: Optional[int] = Field(default=None, ge=1)
+
+
+class SearchRequest(BaseModel):
+    query: str = Field(..., min_length=1)
+    company_name: Optional[str] = None  # restrict DSA matches to one company
+    limit: int = Field(default=5, ge=1, le=25)  # per category
+    use_llm: Literal["auto", "always", "never"] = "auto"  # auto: only when the index isn't confident
 
 
 logging.basicConfig(
@@ -45,67 +85,282 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+# Preload the interview path (langgraph, the Groq SDK, the ranking index) in the background once
+# the server is up; set WARM_UP=0 for instances that only serve the DSA endpoints
+WARM_UP = os.getenv("WARM_UP", "1").lower() not in ("0", "false", "no")
+
+
+async def warm_up_in_background():
+    # Let startup finish and the server start listening first
+    await asyncio.sleep(0)
+    try:
+        await asyncio.to_thread(warm_up)
+        logger.info("Warm-up complete")
+    except Exception:
+        logger.exception("Warm-up failed; the interview path will load on first use")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse dsa.json once before serving so the first request doesn't pay for it
+    get_repository()
+    # Worker pool for the /jobs API
+    get_job_queue().start()
+    warm_up_task = asyncio.create_task(warm_up_in_background()) if WARM_UP else None
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    await get_job_queue().stop()
+
+
 # Create the FastAPI app
 app = FastAPI(
     title="Interview Question Search agent",
     description="API for searching for interview and DSA questions online",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
+# Per-request timing spans; traces go to TRACE_LOG when it is set
+app.add_middleware(TracingMiddleware)
 
 
 @app.get("/", response_description="API Status")
 async def root():
     return {"status": "online", "message": "Candidate Evaluation API is running"}
 
-@app.post("/generate_interview_questions")
-async def generate_interview_questions(request: InterviewRequest):
+async def run_interview_pipeline(request: InterviewRequest):
+    """Scrape, format and LLM-validate interview questions for one request."""
+    # Initialize the state with input data
+    initial_state = InterviewState(input={
+        "company_name": request.company_name,
+        "job_role": request.job_role,
+        "job_description": request.job_description
+    })
+
+    # Execute the workflow (compiled once, on first use)
+    result = await get_interview_graph().ainvoke(initial_state)
+
+    # The graph passes the questions as structured data, no JSON parsing needed
+    parsed_json = result['final_questions']
+
+    # Check and validate the output
+    return await check_output_and_answer(
+        parsed_json,
+        job_role=request.job_role,
+        company_name=request.company_name,
+        job_description=request.job_description,
+        raise_on_fallback=True,
+        deduplicated=True
+    )
+
+async def cached_interview_questions(request: InterviewRequest):
+    # Identical (normalized) requests share one pipeline run and its cached result
     try:
-        # Initialize the state with input data
-        initial_state = InterviewState(input={
-            "company_name": request.company_name,
-            "job_role": request.job_role,
-            "job_description": request.job_description
-        })
-
-        # Execute the workflow
-        app = workflow.compile()
-        result = app.invoke(initial_state)
-
-        # Parse the JSON result
-        parsed_json = json.loads(result['final_json'])
-
-        # Check and validate the output
-        validated_json = check_output_and_answer(
-            parsed_json,
-            job_role=request.job_role,
-            company_name=request.company_name,
-            job_description=request.job_description
+        return await get_result_cache().get_or_compute(
+            cache_key(request.company_name, request.job_role, request.job_description),
+            lambda: run_interview_pipeline(request),
+            cacheable=lambda value: not (isinstance(value, dict) and "error" in value)
         )
+    except ValidationFallback as e:
+        # Served, but raised through the cache so the unvalidated questions aren't remembered
+        return e.fallback
 
-        return validated_json
+@app.post("/generate_interview_questions")
+async def generate_interview_questions(request: InterviewRequest):
+    try:
+        result = await cached_interview_questions(request)
+        # Returned as a response so FastAPI doesn't walk the payload with jsonable_encoder
+        return ORJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate_interview_questions/stream")
+async def generate_interview_questions_stream(request: InterviewRequest):
+    """
+    NDJSON stream of scraped questions per source, then LLM-curated questions as
+    they are generated, so clients can render before the whole pipeline is done.
+    """
+    async def events():
+        async for event in stream_interview_questions(
+            request.company_name, request.job_role, request.job_description
+        ):
+            yield dumps(event) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/jobs/interview_questions", status_code=202)
+async def submit_interview_questions_job(request: InterviewRequest):
+    """
+    Queue an interview-question run on the bounded worker pool and return its
+    job id right away; poll GET /jobs/{job_id} or stream /jobs/{job_id}/stream.
+    Answers 429 with Retry-After when the queue is full.
+    """
+    try:
+        job = get_job_queue().submit(lambda: cached_interview_questions(request))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    return ORJSONResponse(job.to_dict(), status_code=202, headers={"Location": f"/jobs/{job.id}"})
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a job, with its result once it has succeeded."""
+    job = await get_job_queue().lookup(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return ORJSONResponse(job.to_dict())
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str):
+    """NDJSON line per status change of a job; the last line carries the result or error."""
+    if await get_job_queue().lookup(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+
+    async def events():
+        async for job in get_job_queue().watch(job_id):
+            yield dumps(job.to_dict()) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @app.post("/generate_dsa_questions")
 async def generate_dsa_questions(request: CompanyRequest) -> dict[str, list[dict]]:
     try:
-        with open("dsa.json", "r") as file:
-            dsa_data = json.load(file)
-
-        company_name = request.company_name.lower()
+        repository = get_repository()
+        company_name = repository.resolve(request.company_name) or request.company_name.lower()
         print(f"Looking for company: {company_name}")
 
-        if company_name in dsa_data:
-            return {company_name: dsa_data[company_name]}
-        else:
+        # Repeated requests are served from the repository's cache of encoded bodies
+        result = repository.encoded_query(
+            company_name,
+            difficulties=request.difficulty,
+            subtopics=request.subtopics,
+            match_all_subtopics=request.subtopics_match == "all",
+            sort_by=request.sort_by,
+            descending=request.order == "desc",
+            offset=request.offset,
+            limit=request.limit
+        )
+        if result is None:
             raise HTTPException(status_code=404, detail=f"No DSA questions found for {company_name}")
+        total, body = result
+        # Keep the {company: [...]} body; the size of the unpaginated result goes in a header
+        return Response(content=body, media_type="application/json", headers={"X-Total-Count": str(total)})
 
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+@app.post("/generate_dsa_questions/bulk")
+async def generate_dsa_questions_bulk(request: BulkCompanyRequest) -> dict:
+    """
+    DSA sets for several companies in one call, plus an aggregated view with the
+    questions deduplicated across them and ranked by how many of them ask each one.
+    """
+    try:
+        body = get_repository().encoded_bulk(
+            request.company_names,
+            aggregate_limit=request.aggregate_limit,
+            difficulties=request.difficulty,
+            subtopics=request.subtopics,
+            match_all_subtopics=request.subtopics_match == "all",
+            sort_by=request.sort_by,
+            descending=request.order == "desc",
+            limit=request.limit
+        )
+        return Response(content=body, media_type="application/json")
+
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@app.post("/search")
+async def search(request: SearchRequest) -> dict:
+    """DSA and web questions matching a free-text query, prefiltered by a keyword index."""
+    try:
+        result = await get_search_cache().get_or_compute(
+            search_key(request.query, request.company_name, request.limit, request.use_llm),
+            lambda: search_questions(request.query, request.company_name, request.limit, request.use_llm),
+            cacheable=lambda value: value is not None
+        )
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Unknown company {request.company_name}")
+        return ORJSONResponse(result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@app.get("/companies/suggest")
+async def suggest_companies(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)) -> dict[str, list[str]]:
+    return {"suggestions": get_repository().suggest(q, limit)}
+
     
 
+@app.get("/admin/http_cache")
+async def http_cache_stats() -> dict:
+    """Hit/miss counters of the scraped-page cache."""
+    return get_http_cache().snapshot()
+
+
+@app.get("/admin/result_cache")
+async def result_cache_stats() -> dict:
+    """Hit/miss/coalesce counters of the interview-question result cache."""
+    return get_result_cache().snapshot()
+
+
+@app.get("/admin/search_cache")
+async def search_cache_stats() -> dict:
+    """Hit/miss/coalesce counters of the /search result cache."""
+    return get_search_cache().snapshot()
+
+
+@app.get("/admin/sources")
+async def source_stats() -> dict:
+    """Per-source latency percentiles, success rate, current timeout and circuit state of the fetcher."""
+    return get_source_registry().snapshot(max_timeout=FETCH_TIMEOUT)
+
+
+@app.get("/admin/jobs")
+async def job_queue_stats() -> dict:
+    """Depth, running count and outcome counters of the job queue."""
+    return get_job_queue().snapshot()
+
+
+@app.get("/admin/llm")
+async def llm_stats() -> dict:
+    """Call/retry/fallback counters and latency percentiles of the LLM client."""
+    return llm.stats.snapshot()
+
+
+def _snapshot_gauges(prefix: str, snapshot: dict, **labels):
+    for name, value in snapshot.items():
+        if isinstance(value, (int, float)):
+            yield f"{prefix}_{name}", value, labels
+
+
+def _source_gauges():
+    for url, stats in get_source_registry().snapshot(max_timeout=FETCH_TIMEOUT).items():
+        yield from _snapshot_gauges("source", {**stats, "circuit_open": stats["state"] != "closed"}, url=url)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    """Prometheus text format: request/span timings, counters and the cache and LLM stats."""
+    return registry.render([
+        *_snapshot_gauges("http_cache", get_http_cache().snapshot()),
+        *_snapshot_gauges("result_cache", get_result_cache().snapshot()),
+        *_snapshot_gauges("search_cache", get_search_cache().snapshot()),
+        *_snapshot_gauges("llm", llm.stats.snapshot()),
+        *_snapshot_gauges("job_queue", get_job_queue().snapshot()),
+        *_source_gauges(),
+    ])
+
+
 # Run the application if executed directly
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=7070)
@@ -0,0 +1,115 @@
+"""
+Token-budgeted selection of scraped questions for the LLM validation prompt.
+
+Scraped pages contribute hundreds of <h2> headings, many of them navigation or
+footer noise, near-duplicates, or unrelated to the role. Before they go into the
+prompt, questions are filtered for noise and deduplicated with MinHash LSH (see dedup.py), ranked by TF-IDF
+similarity with the company, role and job description (see ranking.py), and
+added in rank order until the token budget is used up. The result is serialized
+without indentation.
+"""
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from dedup import DEDUP_THRESHOLD, MinHashLSH, is_noise
+from ranking import rank_texts
+from telemetry import traced
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 2000))
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+class PromptReport(BaseModel):
+    questions_in: int = 0
+    questions_out: int = 0
+    duplicates_removed: int = 0
+    noise_removed: int = 0
+    prompt_tokens_before: int = 0
+    prompt_tokens_after: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.questions_out}/{self.questions_in} questions "
+                f"({self.duplicates_removed} duplicates, {self.noise_removed} noise removed), "
+                f"~{self.prompt_tokens_before} -> ~{self.prompt_tokens_after} prompt tokens")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: words and punctuation marks each count as one."""
+    return len(_TOKEN.findall(text))
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+@traced("prompt.select")
+def select_questions(questions: Any, job_role: str, company_name: str, job_description: str,
+                     token_budget: Optional[int] = None, deduplicated: bool = False) -> Tuple[Any, PromptReport]:
+    """
+    Pick the most relevant, non-duplicate questions that fit in `token_budget`.
+
+    Args:
+        questions: Scraped question dicts with a 'question' field
+        job_role, company_name, job_description: Used as the relevance query
+        token_budget: Max estimated tokens of the serialized questions
+        deduplicated: The questions already went through dedup.deduplicate, so
+            only noise is filtered here. Items of type 'DSA' are never deduplicated.
+
+    Returns:
+        (selected questions in their original order, report)
+    """
+    if not isinstance(questions, list):
+        return questions, PromptReport()
+    budget = DEFAULT_TOKEN_BUDGET if token_budget is None else token_budget
+    report = PromptReport(questions_in=len(questions))
+
+    candidates: List[Tuple[int, Dict[str, Any]]] = []
+    texts: List[str] = []
+    scraped: List[int] = []  # positions in candidates that are subject to deduplication
+    for index, q in enumerate(questions):
+        text = q.get("question", "") if isinstance(q, dict) else str(q)
+        # DSA problems are exempt: "Path Sum" and "Path Sum II" are different problems
+        if isinstance(q, dict) and q.get("type") == "DSA":
+            candidates.append((index, q))
+            texts.append(text)
+            continue
+        if is_noise(text):
+            report.noise_removed += 1
+            continue
+        if not deduplicated:
+            scraped.append(len(candidates))
+        candidates.append((index, q))
+        texts.append(text)
+
+    # Near-duplicates via LSH buckets rather than comparing every pair
+    if scraped:
+        lsh = MinHashLSH()
+        duplicates = set()
+        for position, signature in zip(scraped, lsh.signatures([texts[i] for i in scraped])):
+            if lsh.query(signature, DEDUP_THRESHOLD) is not None:
+                duplicates.add(position)
+            else:
+                lsh.add(signature)
+        report.duplicates_removed = len(duplicates)
+        candidates = [c for i, c in enumerate(candidates) if i not in duplicates]
+        texts = [t for i, t in enumerate(texts) if i not in duplicates]
+
+    # TF-IDF cosine similarity, computed for all candidates in one matrix product
+    scores = rank_texts(texts, f"{job_role} {company_name} {job_description}")
+    order = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))
+    selected = []
+    used = 2  # the surrounding []
+    for index, q in (candidates[i] for i in order):
+        cost = estimate_tokens(compact_json(q)) + 1
+        if used + cost > budget:
+            continue
+        used += cost
+        selected.append((index, q))
+    selected.sort(key=lambda s: s[0])
+    report.questions_out = len(selected)
+    return [q for _, q in selected], report
@@ -0,0 +1,119 @@
+"""
+Versioned, pre-parsed corpus of scraped interview questions.
+
+`python ingest.py` scrapes the sources offline and writes corpus/questions-<version>.json,
+then atomically repoints corpus/CURRENT at it. QuestionCorpus serves the current
+version from memory and hot-swaps to a new one as soon as CURRENT changes, so the
+request path never touches the network or parses HTML.
+"""
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CORPUS_DIR = os.getenv(
+    "CORPUS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+)
+CURRENT_POINTER = "CURRENT"
+
+
+def write_version(corpus_dir: str, questions: List[Dict[str, str]], sources: Dict[str, Any],
+                  keep: int = 5) -> str:
+    """
+    Write a new corpus version and atomically make it the current one.
+
+    Args:
+        corpus_dir: Directory holding the versions and the CURRENT pointer
+        questions: Deduplicated question dicts ('question', 'link', 'type')
+        sources: Per-source ingestion report stored alongside the questions
+        keep: Number of most recent versions to keep on disk
+
+    Returns:
+        The path of the written version
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    now = time.time()
+    version = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f"{int(now * 1000) % 1000:03d}Z"
+    filename = f"questions-{version}.json"
+    path = os.path.join(corpus_dir, filename)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({
+            "version": version,
+            "created_at": now,
+            "sources": sources,
+            "questions": questions,
+        }, file)
+    os.replace(tmp_path, path)
+
+    # Readers only ever see the old or the new pointer, never a partial write
+    pointer_tmp = os.path.join(corpus_dir, CURRENT_POINTER + ".tmp")
+    with open(pointer_tmp, "w") as file:
+        file.write(filename)
+    os.replace(pointer_tmp, os.path.join(corpus_dir, CURRENT_POINTER))
+
+    versions = sorted(f for f in os.listdir(corpus_dir) if f.startswith("questions-") and f.endswith(".json"))
+    for old in versions[:-keep]:
+        os.remove(os.path.join(corpus_dir, old))
+    return path
+
+
+class QuestionCorpus:
+    """Read-only view of the current corpus version with hot-swap on change."""
+
+    def __init__(self, corpus_dir: str = DEFAULT_CORPUS_DIR, check_interval: float = 5.0):
+        self.corpus_dir = corpus_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._filename: Optional[str] = None
+        self._last_check: Optional[float] = None
+        # (version, questions), swapped as a single reference
+        self._snapshot: Tuple[Optional[str], Tuple[Dict[str, str], ...]] = (None, ())
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            try:
+                with open(os.path.join(self.corpus_dir, CURRENT_POINTER), "r") as file:
+                    filename = file.read().strip()
+            except OSError:
+                return
+            if filename == self._filename:
+                return
+            try:
+                with open(os.path.join(self.corpus_dir, filename), "r") as file:
+                    data = json.load(file)
+            except (OSError, ValueError) as e:
+                # Keep serving the previous version
+                print(f"Question Corpus: Could not load {filename}: {e}")
+                return
+            self._snapshot = (data["version"], tuple(data["questions"]))
+            self._filename = filename
+        print(f"Question Corpus: Serving version {data['version']} ({len(data['questions'])} questions)")
+
+    @property
+    def version(self) -> Optional[str]:
+        self._reload_if_changed()
+        return self._snapshot[0]
+
+    def questions(self) -> Optional[Tuple[Dict[str, str], ...]]:
+        """The current version's questions, or None if no corpus has been ingested yet."""
+        self._reload_if_changed()
+        version, questions = self._snapshot
+        if version is None:
+            return None
+        return questions
+
+
+_corpus: Optional[QuestionCorpus] = None
+
+
+def get_corpus() -> QuestionCorpus:
+    global _corpus
+    if _corpus is None:
+        _corpus = QuestionCorpus()
+    return _corpus
@@ -0,0 +1,165 @@
+"""
+CPU-only relevance ranking of questions against a job description.
+
+Texts are embedded as L2-normalized TF-IDF vectors over the corpus vocabulary,
+so ranking a query is one matrix-vector product followed by an argpartition
+top-k. The index for the static DSA problems is built once, saved as .npy files
+and memory-mapped on load; indexes over scraped questions are small and built in
+memory.
+
+    python ranking.py build     # (re)build the DSA index from dsa.json
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_DSA_INDEX_DIR = os.getenv(
+    "DSA_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "dsa_tfidf")
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "for", "from", "how", "in", "is", "it",
+    "of", "on", "or", "the", "to", "what", "when", "which", "who", "why", "with", "you", "your",
+    "we", "our", "will", "can", "this", "that", "about",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in STOP_WORDS]
+
+
+class TfidfIndex:
+    """Dense, row-normalized TF-IDF matrix over a fixed vocabulary."""
+
+    def __init__(self, vocabulary: dict, idf: np.ndarray, matrix: np.ndarray):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.matrix = matrix
+
+    @classmethod
+    def build(cls, texts: Sequence[str]) -> "TfidfIndex":
+        docs = [tokenize(t) for t in texts]
+        vocabulary = {}
+        for doc in docs:
+            for word in doc:
+                vocabulary.setdefault(word, len(vocabulary))
+        counts = np.zeros((len(docs), len(vocabulary)), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            for word in doc:
+                counts[row, vocabulary[word]] += 1
+        df = np.count_nonzero(counts, axis=0)
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+        return cls(vocabulary, idf, _normalize_rows(np.log1p(counts) * idf))
+
+    def save(self, directory: str, fingerprint: str) -> None:
+        """Write the index; each file is renamed into place so concurrent readers never see a partial file."""
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (("idf.npy", self.idf), ("matrix.npy", self.matrix)):
+            tmp_path = os.path.join(directory, f"{name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as file:
+                np.save(file, array)
+            os.replace(tmp_path, os.path.join(directory, name))
+        # meta.json goes last: its fingerprint marks the arrays as complete
+        tmp_path = os.path.join(directory, f"meta.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump({"fingerprint": fingerprint, "vocabulary": self.vocabulary}, file)
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory: str, fingerprint: Optional[str] = None) -> Optional["TfidfIndex"]:
+        """Memory-map a saved index; None if missing or built from different data."""
+        try:
+            with open(os.path.join(directory, "meta.json"), "r") as file:
+                meta = json.load(file)
+            if fingerprint is not None and meta["fingerprint"] != fingerprint:
+                return None
+            idf = np.load(os.path.join(directory, "idf.npy"))
+            matrix = np.load(os.path.join(directory, "matrix.npy"), mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(meta["vocabulary"], idf, matrix)
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for word in tokenize(text):
+            column = self.vocabulary.get(word)
+            if column is not None:
+                vector[column] += 1
+        vector = np.log1p(vector) * self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def scores(self, query: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of `query` with every row (or only `rows`)."""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        if not len(self.vocabulary):
+            return np.zeros(matrix.shape[0], dtype=np.float32)
+        return matrix @ self.embed(query)
+
+    def top_k(self, query: str, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """The k best (row, score) pairs, best first; row ids refer to the full matrix."""
+        scores = self.scores(query, rows)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        ids = best if rows is None else np.asarray(rows)[best]
+        return [(int(i), float(scores[j])) for i, j in zip(ids, best)]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+
+def rank_texts(texts: Sequence[str], query: str) -> np.ndarray:
+    """Relevance of each text to `query`, using an index built over `texts` themselves."""
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    return TfidfIndex.build(texts).scores(query)
+
+
+def dsa_text(question) -> str:
+    return f"{question.question_name} {' '.join(question.subtopics)}"
+
+
+def dsa_fingerprint(questions: Iterable) -> str:
+    digest = hashlib.sha1()
+    for q in questions:
+        digest.update(dsa_text(q).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_dsa_index(questions: Sequence, directory: str = DEFAULT_DSA_INDEX_DIR,
+                   rebuild: bool = False) -> TfidfIndex:
+    """Memory-map the DSA index for `questions` (rows = question ids), building it if stale."""
+    fingerprint = dsa_fingerprint(questions)
+    index = None if rebuild else TfidfIndex.load(directory, fingerprint)
+    if index is None:
+        built = TfidfIndex.build([dsa_text(q) for q in questions])
+        try:
+            built.save(directory, fingerprint)
+            print(f"Ranking: Built DSA TF-IDF index for {len(questions)} questions in {directory}")
+        except OSError as e:
+            print(f"Ranking: Could not save DSA index to {directory}: {e}")
+        # Prefer the memory-mapped copy so worker processes share its pages
+        index = TfidfIndex.load(directory, fingerprint) or built
+    return index
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["build"]:
+        print("usage: python ranking.py build")
+        sys.exit(1)
+    from dsa_repository import get_repository
+    load_dsa_index(get_repository().store.questions, rebuild=True)
@@ -0,0 +1,190 @@
+"""
+Memoization of /generate_interview_questions and /search results.
+
+Results are keyed by a hash of the normalized (company_name, job_role,
+job_description), so inputs that only differ in case, spacing or punctuation
+share an entry. Lookups go to an in-process LRU first and then, if configured,
+to a shared SQLite tier that several workers can use. Concurrent requests for
+the same key are coalesced into a single run of the pipeline.
+"""
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL = float(os.getenv("RESULT_CACHE_TTL", 6 * 3600))
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 512))
+DEFAULT_DISK_PATH = os.getenv("RESULT_CACHE_PATH")  # unset: memory tier only
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", 3600))
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_NON_WORD.split(text.lower())).strip()
+
+
+def cache_key(company_name: str, job_role: str, job_description: str) -> str:
+    normalized = [normalize_text(company_name), normalize_text(job_role), normalize_text(job_description)]
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+def search_key(query: str, company_name: Optional[str], limit: int, use_llm: str) -> str:
+    normalized = ["search", normalize_text(query), normalize_text(company_name or ""), limit, use_llm]
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """Shared SQLite key -> JSON result store."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, json.dumps(value), expires_at)
+            )
+            self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+
+
+class ResultCache:
+    """TTL'd LRU with an optional disk tier and single-flight request coalescing."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk_path: Optional[str] = DEFAULT_DISK_PATH):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_local(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Return the cached value for `key`, or await `compute()` once and cache it.
+
+        Callers arriving while a computation for the same key is running wait for
+        that computation instead of starting their own; if it is cancelled (its
+        caller timed out or went away) they start over rather than inheriting the
+        cancellation. Values for which `cacheable(value)` is False are returned
+        but not stored.
+        """
+        while True:
+            value = self._get_local(key)
+            if value is not None:
+                self.stats["hits"] += 1
+                return value
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Only our own cancellation propagates; a cancelled leader means try again
+                if not in_flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            if self._disk is not None:
+                stored = await asyncio.to_thread(self._disk.get, key)
+                if stored is not None:
+                    self.stats["disk_hits"] += 1
+                    value, expires_at = stored
+                    self._put_local(key, value, expires_at)
+                    future.set_result(value)
+                    return value
+
+            self.stats["misses"] += 1
+            value = await compute()
+            if cacheable(value):
+                expires_at = time.time() + self.ttl
+                self._put_local(key, value, expires_at)
+                if self._disk is not None:
+                    await asyncio.to_thread(self._disk.put, key, value, expires_at)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"] + stats["coalesced"]
+        stats.update({
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "disk_tier": self._disk is not None,
+            "hit_ratio": (lookups - stats["misses"]) / lookups if lookups else 0.0,
+        })
+        return stats
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
+
+
+_search_cache: Optional[ResultCache] = None
+
+
+def get_search_cache() -> ResultCache:
+    """Separate cache for /search so its entries don't evict interview-question results."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = ResultCache(ttl=SEARCH_CACHE_TTL)
+    return _search_cache
@@ -0,0 +1,71 @@
+"""
+BM25 keyword search over question texts, used to prefilter /search candidates.
+
+The inverted index maps each term to the ids of the documents containing it and
+the term's precomputed BM25 weight in each, so scoring a query only touches the
+postings of its own terms. Besides the score, every hit reports its coverage:
+the share of the query's distinct terms it contains, which /search uses to
+decide whether the index alone found confident matches.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ranking import tokenize
+
+
+class BM25Index:
+    """Immutable inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        docs = [tokenize(t) for t in texts]
+        self.size = len(docs)
+        lengths = np.array([len(doc) for doc in docs], dtype=np.float32)
+        average = float(lengths.mean()) if self.size and lengths.any() else 1.0
+        term_counts: Dict[str, Dict[int, int]] = {}
+        for doc_id, doc in enumerate(docs):
+            for term in doc:
+                counts = term_counts.setdefault(term, {})
+                counts[doc_id] = counts.get(doc_id, 0) + 1
+
+        length_norm = k1 * (1 - b + b * lengths / average)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, counts in term_counts.items():
+            ids = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            idf = math.log(1 + (self.size - len(counts) + 0.5) / (len(counts) + 0.5))
+            self._postings[term] = (ids, (idf * tf * (k1 + 1) / (tf + length_norm[ids])).astype(np.float32))
+
+    def search(self, query: str, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float, float]]:
+        """
+        The k best-scoring documents for `query`, best first.
+
+        Args:
+            query: Free text; tokenized like the documents
+            k: Maximum number of hits
+            rows: If given, only these document ids are considered
+
+        Returns:
+            [(document id, BM25 score, coverage)] for documents matching at least one term
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.size or k <= 0:
+            return []
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=np.int32)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                ids, weights = posting
+                scores[ids] += weights
+                matched[ids] += 1
+        if rows is not None:
+            allowed = np.zeros(self.size, dtype=bool)
+            allowed[rows] = True
+            scores[~allowed] = 0
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(int(i), float(scores[i]), int(matched[i]) / len(terms)) for i in hits]
@@ -0,0 +1,191 @@
+"""
+Per-source health tracking for the fetcher: adaptive timeouts and circuit breaking.
+
+Some sources routinely answer 403 or hang, and without this each of them
+costs the full per-source timeout on every request. The registry keeps, per
+URL, a window of recent response latencies and outcomes:
+
+- the timeout for the next request is a multiple of a recent latency
+  percentile, clamped to [min_timeout, the caller's timeout], so a source
+  that normally answers in 300 ms isn't given 10 s. A request that times
+  out is recorded at the timeout it was given, so repeated timeouts widen
+  the window's percentile and with it the next timeout;
+- after `failure_threshold` consecutive failures the source's circuit opens
+  and it is skipped for `cooldown` seconds;
+- once the cool-down has passed a single request is let through as a
+  half-open probe, with the caller's full timeout so a source that has
+  become permanently slower can still pass it. Success closes the circuit
+  and restarts the latency window from the probe; failure re-opens it with
+  the cool-down doubled, up to `max_cooldown`.
+
+Timeouts, connection errors and any status other than 200/304 count as
+failures; pages served from the HTTP cache don't touch the registry.
+"""
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from telemetry import count
+
+DEFAULT_WINDOW = int(os.getenv("SOURCE_HEALTH_WINDOW", 50))
+DEFAULT_MIN_SAMPLES = 5  # latencies needed before the timeout adapts
+DEFAULT_TIMEOUT_PERCENTILE = float(os.getenv("SOURCE_TIMEOUT_PERCENTILE", 0.95))
+DEFAULT_TIMEOUT_MULTIPLIER = float(os.getenv("SOURCE_TIMEOUT_MULTIPLIER", 2.0))
+DEFAULT_MIN_TIMEOUT = float(os.getenv("SOURCE_MIN_TIMEOUT", 1.0))
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("SOURCE_FAILURE_THRESHOLD", 3))
+DEFAULT_COOLDOWN = float(os.getenv("SOURCE_COOLDOWN", 300))
+DEFAULT_MAX_COOLDOWN = float(os.getenv("SOURCE_MAX_COOLDOWN", 3600))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class SourceHealth:
+    """Rolling latencies/outcomes and circuit state of one source URL."""
+
+    def __init__(self, window: int, cooldown: float):
+        self.latencies: Deque[float] = deque(maxlen=window)  # of successes, and timeouts at their cut-off
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = cooldown
+        self.opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.counters = {"requests": 0, "successes": 0, "failures": 0, "timeouts": 0, "skipped": 0, "probes": 0,
+                         "opened": 0}
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class SourceRegistry:
+    """Health of every source seen by the fetcher, keyed by URL."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, min_samples: int = DEFAULT_MIN_SAMPLES,
+                 timeout_percentile: float = DEFAULT_TIMEOUT_PERCENTILE,
+                 timeout_multiplier: float = DEFAULT_TIMEOUT_MULTIPLIER,
+                 min_timeout: float = DEFAULT_MIN_TIMEOUT,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_COOLDOWN, max_cooldown: float = DEFAULT_MAX_COOLDOWN):
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._sources: Dict[str, SourceHealth] = {}
+
+    def _get(self, url: str) -> SourceHealth:
+        health = self._sources.get(url)
+        if health is None:
+            health = self._sources[url] = SourceHealth(self.window, self.cooldown)
+        return health
+
+    def timeout_for(self, url: str, max_timeout: float) -> float:
+        """Per-request timeout: timeout_multiplier x the recent latency percentile, within [min_timeout, max_timeout]."""
+        health = self._get(url)
+        if health.state != CLOSED or len(health.latencies) < self.min_samples:
+            # Half-open probes get the full timeout; the window may describe a source that has since slowed down
+            return max_timeout
+        adaptive = health.percentile(self.timeout_percentile) * self.timeout_multiplier
+        return min(max_timeout, max(self.min_timeout, adaptive))
+
+    def allow(self, url: str) -> Tuple[bool, bool]:
+        """
+        Whether to request `url` now.
+
+        Returns:
+            (allowed, is_probe); a probe must be followed by record() to release it
+        """
+        health = self._get(url)
+        if health.state == CLOSED:
+            return True, False
+        if health.state == OPEN and time.monotonic() - health.opened_at >= health.cooldown:
+            health.state = HALF_OPEN
+        if health.state == HALF_OPEN and not health.probe_in_flight:
+            health.probe_in_flight = True
+            health.counters["probes"] += 1
+            count("source_circuit", source=_host(url), event="probe")
+            return True, True
+        health.counters["skipped"] += 1
+        count("source_circuit", source=_host(url), event="skipped")
+        return False, False
+
+    def record(self, url: str, ok: bool, elapsed: float, error: Optional[str] = None,
+               timed_out: bool = False) -> None:
+        """Record the outcome of a network request to `url`; `timed_out` marks a failure cut off at its timeout."""
+        health = self._get(url)
+        health.counters["requests"] += 1
+        health.outcomes.append(ok)
+        was_probe, health.probe_in_flight = health.probe_in_flight, False
+        if ok:
+            health.counters["successes"] += 1
+            health.consecutive_failures = 0
+            if health.state != CLOSED:
+                # Latencies from before the outage no longer describe the source
+                health.latencies.clear()
+                health.state, health.opened_at, health.cooldown = CLOSED, None, self.cooldown
+                count("source_circuit", source=_host(url), event="closed")
+            health.latencies.append(elapsed)
+            return
+
+        if timed_out:
+            # The real latency is at least this long
+            health.counters["timeouts"] += 1
+            health.latencies.append(elapsed)
+        health.counters["failures"] += 1
+        health.consecutive_failures += 1
+        health.last_error = error
+        if was_probe or health.state == HALF_OPEN:
+            # The source is still down: back off for longer before the next probe
+            health.cooldown = min(self.max_cooldown, health.cooldown * 2)
+            self._open(url, health)
+        elif health.state == CLOSED and health.consecutive_failures >= self.failure_threshold:
+            self._open(url, health)
+
+    def _open(self, url: str, health: SourceHealth) -> None:
+        health.state = OPEN
+        health.opened_at = time.monotonic()
+        health.counters["opened"] += 1
+        count("source_circuit", source=_host(url), event="opened")
+
+    def snapshot(self, max_timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        sources = {}
+        for url, health in self._sources.items():
+            stats: Dict[str, Any] = dict(health.counters)
+            stats.update({
+                "state": health.state,
+                "consecutive_failures": health.consecutive_failures,
+                "success_rate": sum(health.outcomes) / len(health.outcomes) if health.outcomes else None,
+                "last_error": health.last_error,
+                "retry_in": (max(0.0, health.opened_at + health.cooldown - now)
+                             if health.state == OPEN else None),
+            })
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                stats[f"latency_{name}"] = health.percentile(q)
+            if max_timeout is not None:
+                stats["timeout"] = self.timeout_for(url, max_timeout)
+            sources[url] = stats
+        return sources
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).hostname or url
+
+
+_source_registry: Optional[SourceRegistry] = None
+
+
+def get_source_registry() -> SourceRegistry:
+    global _source_registry
+    if _source_registry is None:
+        _source_registry = SourceRegistry()
+    return _source_registry
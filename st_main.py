@@ -1,16 +1,16 @@
 
 import streamlit as st
-import requests
+from concurrent.futures import ThreadPoolExecutor
 import json
-from bs4 import BeautifulSoup
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List
 from pydantic import BaseModel
-from langchain_groq import ChatGroq
-from langgraph.graph import StateGraph, END
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
+if TYPE_CHECKING:
+    import requests
+
 # Define our state schema using Pydantic
 class InterviewState(BaseModel):
     input: Dict[str, Any]
@@ -18,6 +18,52 @@ class InterviewState(BaseModel):
     formatted_questions: str = ""
     final_json: str = ""
 
+# Seconds scraped questions are reused across submissions
+SCRAPE_CACHE_TTL = int(os.getenv("CLIENT_CACHE_TTL", 600))
+
+# requests, bs4 and langgraph are imported where they are first needed, so the
+# form renders without loading them
+
+@st.cache_resource
+def get_session() -> "requests.Session":
+    """One keep-alive connection pool shared by every rerun and user session."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def scrape_url(url: str) -> List[Dict[str, str]]:
+    from bs4 import BeautifulSoup
+
+    questions = []
+    try:
+        response = get_session().get(url, timeout=10)
+        if response.status_code != 200:
+            return questions
+        soup = BeautifulSoup(response.text, 'html.parser')
+        extracted_questions = soup.find_all('h2')
+        for question in extracted_questions:
+            q_text = question.get_text().strip()
+            if q_text:
+                questions.append({
+                    'question': q_text,
+                    'link': url,
+                    'type': 'DSA' if 'dsa' in url.lower() else 'HR'
+                })
+    except Exception as e:
+        print(f"Exception while fetching {url}: {e}")
+    return questions
+
+@st.cache_data(ttl=SCRAPE_CACHE_TTL, show_spinner=False)
+def scrape_questions(urls: List[str]) -> List[Dict[str, str]]:
+    """Fetch all sources concurrently over the shared session; results keep the source order."""
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return [q for questions in executor.map(scrape_url, urls) for q in questions]
+
 # Fetch interview questions
 def fetch_interview_questions(state: InterviewState) -> InterviewState:
     urls = [
@@ -32,25 +78,7 @@ def fetch_interview_questions(state: InterviewState) -> InterviewState:
         "https://www.simplilearn.com/tutorials/data-structure-tutorial/data-structure-interview-questions",
         "https://www.educative.io/blog/crack-system-design-interview"
     ]
-    questions = []
-    for url in urls:
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                continue
-            soup = BeautifulSoup(response.text, 'html.parser')
-            extracted_questions = soup.find_all('h2')
-            for question in extracted_questions:
-                q_text = question.get_text().strip()
-                if q_text:
-                    questions.append({
-                        'question': q_text,
-                        'link': url,
-                        'type': 'DSA' if 'dsa' in url.lower() else 'HR'
-                    })
-        except Exception as e:
-            print(f"Exception while fetching {url}: {e}")
-    state.questions = questions
+    state.questions = scrape_questions(urls)
     return state
 
 # Format questions for display
@@ -66,18 +94,22 @@ def create_json(state: InterviewState) -> InterviewState:
     state.final_json = json.dumps(state.questions, indent=4)
     return state
 
-# Build the LangGraph workflow
-workflow = StateGraph(InterviewState)
-workflow.add_node("fetcher", fetch_interview_questions)
-workflow.add_node("formatter", format_questions)
-workflow.add_node("json_creator", create_json)
+@st.cache_resource
+def get_app_flow():
+    """Build the LangGraph workflow and compile it once per process instead of on every rerun of this script."""
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(InterviewState)
+    workflow.add_node("fetcher", fetch_interview_questions)
+    workflow.add_node("formatter", format_questions)
+    workflow.add_node("json_creator", create_json)
 
-workflow.add_edge("fetcher", "formatter")
-workflow.add_edge("formatter", "json_creator")
-workflow.add_edge("json_creator", END)
+    workflow.add_edge("fetcher", "formatter")
+    workflow.add_edge("formatter", "json_creator")
+    workflow.add_edge("json_creator", END)
 
-workflow.set_entry_point("fetcher")
-app_flow = workflow.compile()
+    workflow.set_entry_point("fetcher")
+    return workflow.compile()
 
 # Streamlit App
 st.set_page_config(page_title="Interview Questions Generator", page_icon="💼", layout="wide")
@@ -104,7 +136,7 @@ if submitted:
                 "job_role": job_role,
                 "job_description": job_description
             })
-            result = app_flow.invoke(initial_state)
+            result = get_app_flow().invoke(initial_state)
 
             # Display final JSON nicely
             try:
@@ -0,0 +1,255 @@
+"""
+Timing spans, counters and per-request traces for the API and the pipeline.
+
+    with span("fetch", labels={"source": host}, url=url) as attrs:
+        ...                                  # timed; attrs can be extended
+    count("bytes_downloaded", n, source=host)
+
+    @traced("node.formatter")                # same as a span around the call
+    def format_questions(state): ...
+
+Span durations feed the `ez_search_span_seconds` histogram and counters are
+summed per label set; both are rendered in the Prometheus text format for
+GET /metrics. While a request runs under TracingMiddleware, its spans and
+counters are also collected into a Trace (shared by the tasks and worker
+threads it starts, through contextvars) and, when TRACE_LOG is set, appended
+to that file as one JSON line per request.
+"""
+import os
+import json
+import time
+import uuid
+import inspect
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+METRIC_PREFIX = "ez_search"
+TRACE_LOG = os.getenv("TRACE_LOG")  # unset: traces are not written
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Registry:
+    """Process-wide counters and histograms."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> label key -> [per-bucket counts..., +Inf count, sum]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def render(self, gauges: Iterable[Tuple[str, float, Dict[str, Any]]] = ()) -> str:
+        """Prometheus text exposition of everything recorded, plus the given (name, value, labels) gauges."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+                for key, value in series.items():
+                    lines.append(f"{METRIC_PREFIX}_{name}_total{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, state in series.items():
+                    cumulative = 0.0
+                    for bound, n in zip(self.buckets, state):
+                        cumulative += n
+                        le = 'le="%g"' % bound
+                        lines.append(f"{metric}_bucket{_format_labels(key, le)} {cumulative:g}")
+                    total = cumulative + state[len(self.buckets)]
+                    le = 'le="+Inf"'
+                    lines.append(f"{metric}_bucket{_format_labels(key, le)} {total:g}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {state[-1]:.6f}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {total:g}")
+        typed = set()
+        for name, value, labels in gauges:
+            metric = f"{METRIC_PREFIX}_{name}"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{_format_labels(_label_key(labels))} {float(value):g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class Trace:
+    """Spans and counters recorded while handling one request."""
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, float] = {}
+
+    def offset(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": round(self.offset(), 6),
+            "spans": sorted(self.spans, key=lambda s: s["start"]),
+            "counters": self.counters,
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, labels: Optional[Dict[str, Any]] = None, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block.
+
+    `labels` become histogram labels (keep them low-cardinality); `attrs`, and
+    anything the block adds to the yielded dict, only go into the request trace.
+    """
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    offset = trace.offset() if trace is not None else 0.0
+    start = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        registry.observe("span_seconds", duration, {"span": name, **(labels or {})})
+        if trace is not None:
+            record = {"name": name, "parent": parent, "start": round(offset, 6), "duration": round(duration, 6)}
+            if labels or attrs:
+                record["attrs"] = {**(labels or {}), **attrs}
+            if error is not None:
+                record["error"] = error
+            trace.spans.append(record)
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a sync or async function in span(name)."""
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Add `value` to counter `name` (and to the current request's trace)."""
+    registry.inc(name, value, labels)
+    trace = _current_trace.get()
+    if trace is not None:
+        key = name + _format_labels(_label_key(labels))
+        trace.counters[key] = trace.counters.get(key, 0) + value
+
+
+_trace_log_lock = threading.Lock()
+
+
+def write_trace(trace: Trace, path: Optional[str] = TRACE_LOG) -> None:
+    if not path:
+        return
+    line = json.dumps(trace.to_dict(), default=str)
+    with _trace_log_lock, open(path, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware giving each HTTP request a Trace, timing it (including a
+    streamed body) and returning the trace id in an X-Trace-Id header.
+    """
+
+    def __init__(self, app, trace_log: Optional[str] = TRACE_LOG, exclude: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.trace_log = trace_log
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_with_trace_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", trace.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            _current_trace.reset(token)
+            # The matched route template keeps label cardinality bounded
+            route = scope.get("route")
+            labels = {"method": scope["method"], "path": getattr(route, "path", "unmatched"), "status": status}
+            registry.observe("request_seconds", trace.offset(), labels)
+            registry.inc("requests", 1, labels)
+            write_trace(trace, self.trace_log)
@@ -0,0 +1,27 @@
+from prompt_builder import select_questions
+
+NUMBERED_TITLES = ["Path Sum", "Path Sum II", "Path Sum III", "Word Break", "Word Break II",
+                   "Jump Game", "Jump Game II", "Stone Game", "Stone Game II", "Stone Game III"]
+
+
+def test_dsa_titles_differing_by_roman_numeral_all_survive():
+    questions = [{"question": title, "link": "https://leetcode.com", "type": "DSA"} for title in NUMBERED_TITLES]
+    selected, report = select_questions(questions, "Software Engineer", "Google", "", token_budget=10_000)
+    assert [q["question"] for q in selected] == NUMBERED_TITLES
+    assert report.duplicates_removed == 0
+
+
+def test_deduplicated_questions_are_not_deduplicated_again():
+    questions = [{"question": title, "link": "https://example.com", "type": "Technical"} for title in NUMBERED_TITLES]
+    selected, report = select_questions(questions, "Software Engineer", "Google", "", token_budget=10_000,
+                                        deduplicated=True)
+    assert len(selected) == len(NUMBERED_TITLES)
+    assert report.duplicates_removed == 0
+
+
+def test_scraped_near_duplicates_are_removed():
+    questions = [{"question": "What is a binary search tree?", "link": "https://a.com", "type": "Technical"},
+                 {"question": "What is a binary search tree ?", "link": "https://b.com", "type": "Technical"}]
+    selected, report = select_questions(questions, "Software Engineer", "Google", "", token_budget=10_000)
+    assert len(selected) == 1
+    assert report.duplicates_removed == 1
@@ -1,102 +1,258 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import hashlib
 import json
-from langchain.tools import tool
-from langgraph.graph import StateGraph, END
+import time
 from pydantic import BaseModel
-from typing import Dict, Any, List, TypedDict
+from typing import AsyncIterator, Dict, Any, List
 import os
 from dotenv import load_dotenv
 load_dotenv()
-from langchain_groq import ChatGroq
+from fetcher import SOURCE_URLS, fetch_all, fetch_as_completed
+from http_cache import get_http_cache
+from source_health import get_source_registry
+from question_corpus import get_corpus
+from extractors import extract_questions
+from dedup import deduplicate
+from json_stream import JSONItemStream
+from prompt_builder import compact_json, estimate_tokens, select_questions
+from dsa_repository import get_repository
+from llm import complete_json, complete_json_batch, stats, stream_completion
+from search_index import BM25Index
+from telemetry import span, traced
 
 # Define our state schema using Pydantic BaseModel
 class InterviewState(BaseModel):
     input: Dict[str, Any]  # Contains: company name, job role, job description
     questions: List[Dict[str, str]] = []  # Fetched questions as a list of dictionaries
+    dsa_questions: List[Dict[str, str]] = []  # The company's DSA problems, distinct by construction
     formatted_questions: str = ""  # Readable formatted questions
-    final_json: str = ""  # Final structured JSON output
+    final_questions: List[Dict[str, str]] = []  # Final structured output
+    dedup_report: Dict[str, Any] = {}  # Items kept, and removed per source by the deduplicator
+
+# Number of company DSA problems, ranked against the role and job description, offered to the LLM
+DSA_PROMPT_CANDIDATES = int(os.getenv("DSA_PROMPT_CANDIDATES", 10))
+
+def relevant_dsa_questions(company_name: str, job_role: str, job_description: str,
+                           k: int = DSA_PROMPT_CANDIDATES) -> List[Dict[str, str]]:
+    """The company's DSA problems most relevant to the role, in the scraped-question shape."""
+    repository = get_repository()
+    company = repository.resolve(company_name)
+    if company is None or k <= 0:
+        return []
+    ranked = repository.rank(f"{job_role} {job_description}", k, company)
+    return [{'question': q['question_name'], 'link': q['question_link'].strip(), 'type': 'DSA'} for q, _ in ranked]
+
+# How long scraped questions are reused when some sources failed, before they are retried
+SCRAPE_RETRY_INTERVAL = float(os.getenv("SCRAPE_RETRY_INTERVAL", 300))
+
+# (scrape version, questions, reusable until); see collect_web_questions
+_scraped_questions = (None, [], 0.0)
+# url -> (body digest, extracted questions), so only changed pages are parsed again
+_page_questions: Dict[str, Any] = {}
+# The refresh shared by every request that finds the scraped questions stale
+_scrape_task = None
+
+async def collect_web_questions():
+    """
+    Load interview questions from the ingested corpus, or scrape all source URLs
+    concurrently if `python ingest.py` hasn't published a corpus yet.
+
+    Scraped questions are reused without fetching until the oldest page goes
+    stale (by its HTTP-cache fetch time), and concurrent requests share one
+    refresh. They are versioned by the page bodies, so a refresh that finds
+    the pages unchanged (e.g. all 304s) keeps the extraction and search index.
+
+    Returns:
+        (questions, corpus or scrape version)
+    """
+    global _scrape_task
+    corpus = get_corpus()
+    corpus_questions = corpus.questions()
+    if corpus_questions is not None:
+        print(f"Fetcher Agent: Loaded {len(corpus_questions)} questions from corpus version {corpus.version}.")
+        return list(corpus_questions), corpus.version
+
+    version, questions, reusable_until = _scraped_questions
+    if version is not None and time.time() < reusable_until:
+        return list(questions), version
+    task = _scrape_task
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = _scrape_task = asyncio.create_task(_scrape_web_questions())
+    # Shielded so one cancelled request doesn't cancel the refresh under the others
+    questions, version = await asyncio.shield(task)
+    return list(questions), version
+
+async def _scrape_web_questions():
+    global _scraped_questions
+    # All sources are fetched in parallel; results come back in source order
+    cache = get_http_cache()
+    results = await fetch_all(SOURCE_URLS, cache=cache, health=get_source_registry())
+    now = time.time()
+    fetched = [result for result in results if result.ok]
+    if fetched and all(result.fetched_at is not None for result in fetched):
+        reusable_until = min(result.fetched_at for result in fetched) + cache.ttl
+    else:
+        reusable_until = now + SCRAPE_RETRY_INTERVAL if not fetched else now
+    if len(fetched) < len(results):
+        reusable_until = min(reusable_until, now + SCRAPE_RETRY_INTERVAL)
+
+    questions, digests = [], []
+    for result in results:
+        if result.error is not None:
+            print(f"Fetcher Agent: Exception occurred while fetching {result.url}: {result.error}")
+        elif not result.ok:
+            print(f"Fetcher Agent: Failed to fetch {result.url} (Status Code: {result.status_code})")
+        else:
+            if result.from_cache:
+                print(f"Fetcher Agent: Served {result.url} from cache.")
+            digest = hashlib.sha1(result.text.encode("utf-8")).hexdigest()
+            cached_digest, extracted = _page_questions.get(result.url, (None, None))
+            if cached_digest != digest:
+                # Parse off the event loop so other requests keep being served
+                extracted = await asyncio.to_thread(extract_questions, result.url, result.text)
+                _page_questions[result.url] = (digest, extracted)
+            print(f"Fetcher Agent: Found {len(extracted)} potential questions in {result.url}.")
+            questions.extend(extracted)
+            digests.append((result.url, digest))
+
+    version = "scraped:" + hashlib.sha1(repr(digests).encode("utf-8")).hexdigest()[:12]
+    _scraped_questions = (version, questions, reusable_until)
+    return questions, version
 
 # Define the node functions (not tools) that operate on the state
-def fetch_interview_questions(state: InterviewState) -> InterviewState:
-    """Fetch interview questions from external URLs."""
+@traced("node.fetcher")
+async def fetch_interview_questions(state: InterviewState) -> InterviewState:
+    """Collect the scraped interview questions plus the company's most relevant DSA problems."""
     print("Fetcher Agent: Starting to fetch interview questions...")
-    urls = [
-    "https://www.geeksforgeeks.org/top-100-data-structure-and-algorithms-dsa-interview-questions-topic-wise/",
-    "https://www.indeed.com/career-advice/interviewing/hr-interview-questions",
-    "https://www.interviewbit.com/hr-interview-questions/",
-    "https://leetcode.com/discuss/general-discussion/459219/blind-75-leetcode-questions",
-    "https://www.javatpoint.com/data-structure-interview-questions",
-    "https://www.hackerrank.com/interview/interview-preparation-kit",
-    "https://www.careerride.com/Interview-Questions.aspx",
-    "https://www.toptal.com/interview-questions",
-    "https://www.simplilearn.com/tutorials/data-structure-tutorial/data-structure-interview-questions",
-    "https://www.educative.io/blog/crack-system-design-interview"
-]
-
-    questions = []
-    for url in urls:
-        print(f"Fetcher Agent: Fetching URL: {url}")
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                print(f"Fetcher Agent: Failed to fetch {url} (Status Code: {response.status_code})")
-                continue
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Example extraction: find all <h2> tags (adjust as needed)
-            extracted_questions = soup.find_all('h2')
-            print(f"Fetcher Agent: Found {len(extracted_questions)} potential questions.")
-            for question in extracted_questions:
-                q_text = question.get_text().strip()
-                if q_text:
-                    questions.append({
-                        'question': q_text,
-                        'link': url,
-                        'type': 'DSA' if 'dsa' in url.lower() else 'HR'
-                    })
-        except Exception as e:
-            print(f"Fetcher Agent: Exception occurred while fetching {url}: {e}")
+    # The first ranking may load or build the TF-IDF index; keep it off the event loop, alongside the scrape
+    dsa_questions, (questions, _) = await asyncio.gather(
+        asyncio.to_thread(
+            relevant_dsa_questions, state.input.get("company_name", ""), state.input.get("job_role", ""),
+            state.input.get("job_description", "")
+        ),
+        collect_web_questions()
+    )
+    # Kept apart until the deduplicator so similar problem titles ("Path Sum", "Path Sum II") all survive
     state.questions = questions
+    state.dsa_questions = dsa_questions
     print("Fetcher Agent: Finished fetching questions.")
     return state
-def filter_requests_on_user_query(dsa_question: dict , wed_question:dict,user_query : str):
-    
-    # Initialize the Groq chat model
-    chat = ChatGroq(temperature=0.1, model="llama-3.3-70b-versatile")
-    
-    # Create a prompt template
-    prompt = ChatPromptTemplate.from_template("""
+
+# Candidates per category that the BM25 prefilter hands to the LLM
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", 20))
+# A hit is confident when it contains at least this share of the query's terms
+SEARCH_CONFIDENT_COVERAGE = float(os.getenv("SEARCH_CONFIDENT_COVERAGE", 1.0))
+
+# (corpus or scrape version, index); rebuilt when the questions change
+_web_search_index = (None, None)
+
+def web_search_index(questions, version):
+    global _web_search_index
+    cached_version, index = _web_search_index
+    if version is None or cached_version != version:
+        index = BM25Index([q.get("question", "") for q in questions])
+        if version is not None:
+            _web_search_index = (version, index)
+    return index
+
+async def filter_requests_on_user_query(dsa_questions: list, web_questions: list, user_query: str, limit: int = 5):
+    """
+    Ask the LLM to pick (and, if useful, reword) the candidates that best match the user's query.
+
+    Returns:
+        dict with 'dsa_questions' and 'web_questions' lists
+    """
+    prompt = f"""
     Given the following sets of interview questions and a user query, filter and modify the questions to best match the user's request. Return the result as a JSON object.
 
-    DSA Questions: {dsa_questions}
-    Web Questions: {web_questions}
+    DSA Questions: {compact_json(dsa_questions)}
+    Web Questions: {compact_json(web_questions)}
     User Query: {user_query}
 
     Instructions:
     1. Select relevant questions from both sets based on the user query.
     2. Modify questions if necessary to better fit the user's needs.
     3. Ensure the output is a valid JSON object with 'dsa_questions' and 'web_questions' as keys.
-    4. Limit the total number of questions to 10 (5 for each category if possible).
+    4. Limit the total number of questions to {2 * limit} ({limit} for each category if possible).
 
     Return only the JSON object with the filtered and modified questions.
-    """)
+    """
+    result = await complete_json(
+        [
+            {"role": "system", "content": VALIDATION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        model=VALIDATION_MODEL,
+        temperature=0.1
+    )
+    if not isinstance(result, dict):
+        raise ValueError("LLM response is not a JSON object")
+    return {key: list(result.get(key) or [])[:limit] for key in ("dsa_questions", "web_questions")}
 
-    # Create the parser
-    parser = JsonOutputParser()
+@traced("search")
+async def search_questions(user_query: str, company_name: str = None, limit: int = 5, use_llm: str = "auto"):
+    """
+    Combined DSA + web question search for a free-text query.
 
-    # Create the chain
-    chain = prompt | chat | parser
+    A BM25 index cuts both sets down to SEARCH_CANDIDATES each. With use_llm="auto"
+    the LLM is only asked to refine them when the index didn't find `limit`
+    confident matches on its own; "never"/"always" force either path. If the LLM
+    call fails the index results are returned.
 
-    # Invoke the chain
-    result = chain.invoke({
-        "dsa_questions": json.dumps(dsa_questions),
-        "web_questions": json.dumps(web_questions),
-        "user_query": user_query
-    })
-    
-    return json.dumps(result,indent=2)
+    Returns:
+        The result dict, or None if `company_name` is not a known company
+    """
+    repository = get_repository()
+    company = None
+    if company_name:
+        company = repository.resolve(company_name)
+        if company is None:
+            return None
+    # Both indexes are built on first use (and the web one again when the questions change); keep that
+    # and the scoring off the event loop
+    dsa_hits = await asyncio.to_thread(repository.search, user_query, SEARCH_CANDIDATES, company)
+    web_questions, version = await collect_web_questions()
+    web_ranked = await asyncio.to_thread(
+        lambda: web_search_index(web_questions, version).search(user_query, SEARCH_CANDIDATES)
+    )
+    web_hits = [(web_questions[i], score, coverage) for i, score, coverage in web_ranked]
+
+    dsa_matches = [{**q, "score": round(score, 3)} for q, score, _ in dsa_hits]
+    web_matches = [{**q, "score": round(score, 3)} for q, score, _ in web_hits]
+    confident = sum(coverage >= SEARCH_CONFIDENT_COVERAGE for _, _, coverage in dsa_hits[:limit] + web_hits[:limit])
+    result = {
+        "query": user_query,
+        "company_name": company,
+        "source": "index",
+        "candidates": len(dsa_matches) + len(web_matches),
+        "confident_matches": confident,
+        "dsa_questions": dsa_matches[:limit],
+        "web_questions": web_matches[:limit],
+    }
+    if use_llm == "never" or not result["candidates"] or (use_llm == "auto" and confident >= limit):
+        return result
+
+    stats.counters["search_requests"] += 1
+    try:
+        filtered = await filter_requests_on_user_query(dsa_matches, web_matches, user_query, limit)
+    except Exception as e:
+        stats.counters["search_fallbacks"] += 1
+        print(f"Search: LLM filtering failed ({type(e).__name__}: {e}), returning index matches")
+        return result
+    result.update(filtered, source="llm")
+    return result
     
     
+@traced("node.deduplicator")
+def deduplicate_questions(state: InterviewState) -> InterviewState:
+    """Drop noise headings and near-duplicate scraped questions (MinHash/LSH, see dedup.py), then add the DSA problems."""
+    questions, state.dedup_report = deduplicate(state.questions)
+    print(f"Deduplicator Agent: Kept {len(questions)} of {len(state.questions)} scraped questions, "
+          f"removed per source: {state.dedup_report['removed']}")
+    state.questions = questions + state.dsa_questions
+    return state
+
+@traced("node.formatter")
 def format_questions(state: InterviewState) -> InterviewState:
     """Format interview questions from JSON to a readable text format."""
     print("Formatter Agent: Formatting questions...")
@@ -107,35 +263,23 @@ def format_questions(state: InterviewState) -> InterviewState:
     print("Formatter Agent: Formatting complete.")
     return state
 
+@traced("node.json_creator")
 def create_json(state: InterviewState) -> InterviewState:
-    """Create structured JSON output from the formatted questions."""
+    """Create the structured output from the fetched questions."""
     print("JSON Creator Agent: Creating structured JSON...")
-    state.final_json = json.dumps(state.questions, indent=4)
+    # Kept as Python objects: serializing here only for the API to parse it back cost a round trip
+    state.final_questions = state.questions
     print("JSON Creator Agent: JSON creation complete.")
     return state
 
-def check_output_and_answer(parsed_json,job_role="Software Engineer",company_name="Google",job_description="Responsible for developing scalable software solutions."):
-    """
-    Validates and enhances JSON output from Groq Llama model.
-    
-    Args:
-        parsed_json: The JSON object to validate
-        
-    Returns:
-        Modified and validated JSON object
-    """
-    from groq import Groq
-    import json
-    
-    # Initialize Groq client
-    client = Groq()
-    model = "llama-3.3-70b-versatile" 
-    
-    # Prepare the validation prompt
-    validation_prompt = f"""
+VALIDATION_MODEL = "llama-3.3-70b-versatile"
+VALIDATION_SYSTEM_PROMPT = "You are a JSON validation assistant. Only respond with valid JSON."
+
+def render_validation_prompt(questions_json, job_role, company_name, job_description, max_questions=15):
+    return f"""
 As an AI assistant specializing in interview question validation, your task is to analyze and improve the following JSON output containing interview questions:
 
-{json.dumps(parsed_json, indent=2)}
+{questions_json}
 
 Please perform the following actions:
 
@@ -156,29 +300,129 @@ Please perform the following actions:
 
 5. Maintain the original structure of the JSON, including the 'question', 'link', and 'type' fields for each entry.
 
-6. Limit the total number of questions to a maximum of 15, prioritizing the most relevant and insightful ones.
+6. Limit the total number of questions to a maximum of {max_questions}, prioritizing the most relevant and insightful ones.
 
 Return only a valid JSON object with the improved and curated list of interview questions. Each question should be meaningful, relevant, and appropriate for the specified job role and company.
 """
 
+def build_validation_prompt(parsed_json, job_role, company_name, job_description, token_budget=None,
+                            deduplicated=False):
+    """
+    Build the prompt asking the LLM to validate and curate the scraped questions.
+
+    Only the most relevant, deduplicated questions that fit in the token budget
+    are included, serialized compactly.
+
+    Returns:
+        (prompt, PromptReport with the estimated prompt tokens before and after)
+    """
+    prompts, report = build_validation_prompts(parsed_json, job_role, company_name, job_description,
+                                               token_budget, chunk_size=None, deduplicated=deduplicated)
+    return prompts[0], report
+
+# Selected questions per validation request; larger sets are split and validated in parallel
+VALIDATION_CHUNK_SIZE = int(os.getenv("VALIDATION_CHUNK_SIZE", 25))
+MAX_VALIDATED_QUESTIONS = 15
+
+def build_validation_prompts(parsed_json, job_role, company_name, job_description, token_budget=None,
+                             chunk_size=VALIDATION_CHUNK_SIZE, deduplicated=False):
+    """
+    Like build_validation_prompt, but splits the selected questions into chunks of
+    `chunk_size` with one prompt each; the question limit is shared between them.
+    Pass deduplicated=True for questions that already went through the
+    deduplicator, so they aren't deduplicated a second time.
+
+    Returns:
+        (list of prompts, PromptReport covering all of them)
+    """
+    selected, report = select_questions(parsed_json, job_role, company_name, job_description, token_budget,
+                                        deduplicated)
+    if isinstance(selected, list) and chunk_size and len(selected) > chunk_size:
+        chunks = [selected[i:i + chunk_size] for i in range(0, len(selected), chunk_size)]
+    else:
+        chunks = [selected]
+    max_questions = -(-MAX_VALIDATED_QUESTIONS // len(chunks))
+    prompts = [render_validation_prompt(compact_json(chunk), job_role, company_name, job_description, max_questions)
+               for chunk in chunks]
+    report.prompt_tokens_before = estimate_tokens(
+        render_validation_prompt(json.dumps(parsed_json, indent=2), job_role, company_name, job_description)
+    )
+    report.prompt_tokens_after = sum(estimate_tokens(prompt) for prompt in prompts)
+    print(f"Prompt Builder: {report.summary()} in {len(prompts)} prompt(s)")
+    return prompts, report
+
+def _merge_validated(results):
+    """Combine the JSON objects returned for each chunk into one, keeping the first result's shape."""
+    if len(results) == 1:
+        return results[0]
+    key, merged = "questions", []
+    for result in results:
+        if isinstance(result, list):
+            merged.extend(result)
+            continue
+        for name, value in (result.items() if isinstance(result, dict) else ()):
+            if isinstance(value, list):
+                key = name if not merged else key
+                merged.extend(value)
+                break
+    return {key: merged[:MAX_VALIDATED_QUESTIONS]}
+
+class ValidationFallback(Exception):
+    """LLM validation failed; `fallback` holds the unvalidated questions to serve instead (uncached)."""
+
+    def __init__(self, fallback):
+        super().__init__("LLM validation failed, unvalidated questions returned")
+        self.fallback = fallback
+
+@traced("validator")
+async def check_output_and_answer(parsed_json,job_role="Software Engineer",company_name="Google",job_description="Responsible for developing scalable software solutions.",
+                                  raise_on_fallback=False, deduplicated=False):
+    """
+    Validates and enhances JSON output from Groq Llama model.
+
+    Large question sets are split into chunks that are validated in parallel
+    through the shared LLM client (see llm.py).
+    
+    Args:
+        parsed_json: The JSON object to validate
+        raise_on_fallback: Raise ValidationFallback instead of returning the
+            unvalidated questions, so callers can tell them apart (e.g. not cache them)
+        deduplicated: The questions come from the pipeline's deduplicator
+        
+    Returns:
+        Modified and validated JSON object
+    """
+    stats.counters["requests"] += 1
+
+    # Prepare the validation prompts
+    # Selection ranks and deduplicates the whole scraped list; keep it off the event loop
+    validation_prompts, _ = await asyncio.to_thread(
+        build_validation_prompts, parsed_json, job_role, company_name, job_description, deduplicated=deduplicated
+    )
     
     # Set up response format to ensure JSON output
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a JSON validation assistant. Only respond with valid JSON."},
-                {"role": "user", "content": validation_prompt}
+        results = await complete_json_batch(
+            [
+                [
+                    {"role": "system", "content": VALIDATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ]
+                for prompt in validation_prompts
             ],
-            response_format={"type": "json_object"},
+            model=VALIDATION_MODEL,
             temperature=0.2
         )
-        
-        # Parse the validated JSON
-        validated_json = json.loads(response.choices[0].message.content)
-        return validated_json
+        validated = [result for result in results if not isinstance(result, BaseException)]
+        if not validated:
+            raise results[0]
+        if len(validated) < len(results):
+            print(f"Validator: {len(results) - len(validated)}/{len(results)} chunks failed, using the rest")
+        return _merge_validated(validated)
     
     except Exception as e:
+        stats.counters["fallbacks"] += 1
+        print(f"Validator: LLM validation failed ({type(e).__name__}: {e}), returning unvalidated questions")
         # If validation fails, attempt to fix the structure
         try:
             # Try to fix common JSON issues
@@ -188,55 +432,104 @@ Return only a valid JSON object with the improved and curated list of interview
             # Remove any invalid fields (example implementation)
             if isinstance(parsed_json, dict):
                 # Filter out any fields with None values or empty strings
-                cleaned_json = {k: v for k, v in parsed_json.items() if v is not None and v != ""}
-                return cleaned_json
+                fallback = {k: v for k, v in parsed_json.items() if v is not None and v != ""}
             else:
-                return parsed_json
+                fallback = parsed_json
         except:
             # If all else fails, return an error message as JSON
-            return {"error": "Invalid JSON structure", "original": str(parsed_json)}
+            fallback = {"error": "Invalid JSON structure", "original": str(parsed_json)}
+        if raise_on_fallback:
+            raise ValidationFallback(fallback) from e
+        return fallback
 
     
 
-# Build the workflow using LangGraph with our InterviewState schema
-workflow = StateGraph(InterviewState)
-workflow.add_node("fetcher", fetch_interview_questions)
-workflow.add_node("formatter", format_questions)
-workflow.add_node("json_creator", create_json)
+async def stream_interview_questions(company_name: str, job_role: str, job_description: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of the workflow + check_output_and_answer pipeline.
+
+    Yields events as they become available: {"event": "source"} with the scraped
+    questions of each source as soon as it finishes, then {"event": "question"}
+    for every LLM-curated question as the streamed completion produces it, and
+    finally {"event": "done"}. Failures are reported as "source_error"/"error"
+    events instead of aborting the stream.
+    """
+    dsa_questions = await asyncio.to_thread(relevant_dsa_questions, company_name, job_role, job_description)
+    if dsa_questions:
+        yield {"event": "source", "source": "dsa", "questions": dsa_questions}
+    questions = []
+    corpus = get_corpus()
+    corpus_questions = corpus.questions()
+    if corpus_questions is not None:
+        questions.extend(corpus_questions)
+        yield {"event": "source", "source": f"corpus:{corpus.version}", "questions": list(corpus_questions)}
+    else:
+        async for result in fetch_as_completed(SOURCE_URLS, cache=get_http_cache(), health=get_source_registry()):
+            if not result.ok:
+                yield {"event": "source_error", "source": result.url,
+                       "detail": result.error or f"Status Code: {result.status_code}"}
+                continue
+            extracted = await asyncio.to_thread(extract_questions, result.url, result.text)
+            questions.extend(extracted)
+            yield {"event": "source", "source": result.url, "questions": extracted}
 
-workflow.add_edge("fetcher", "formatter")
-workflow.add_edge("formatter", "json_creator")
-workflow.add_edge("json_creator", END)
+    validated = 0
+    questions = dsa_questions + (await asyncio.to_thread(deduplicate, questions))[0]
+    validation_prompt, report = await asyncio.to_thread(
+        build_validation_prompt, questions, job_role, company_name, job_description, deduplicated=True
+    )
+    yield {"event": "prompt", **report.model_dump()}
+    try:
+        items = JSONItemStream()
+        messages = [
+            {"role": "system", "content": VALIDATION_SYSTEM_PROMPT},
+            {"role": "user", "content": validation_prompt}
+        ]
+        async for delta in stream_completion(messages, model=VALIDATION_MODEL, temperature=0.2):
+            for question in items.feed(delta):
+                validated += 1
+                yield {"event": "question", "question": question}
+    except Exception as e:
+        yield {"event": "error", "detail": str(e)}
+    yield {"event": "done", "scraped": len(questions), "validated": validated}
 
-workflow.set_entry_point("fetcher")
 
+def build_interview_graph():
+    """Build and compile the LangGraph workflow over InterviewState."""
+    # langgraph (and the langchain stack under it) is imported here rather than at module
+    # load, so processes that only serve the DSA endpoints never pay for it
+    from langgraph.graph import StateGraph, END
 
-# if __name__ == "__main__":
-#     company_name = "Google"
-#     job_role = "Software Engineer"
-#     job_description = "Responsible for developing scalable software solutions."
+    workflow = StateGraph(InterviewState)
+    workflow.add_node("fetcher", fetch_interview_questions)
+    workflow.add_node("deduplicator", deduplicate_questions)
+    workflow.add_node("formatter", format_questions)
+    workflow.add_node("json_creator", create_json)
 
-#     print("Starting the multi-agent execution workflow...")
+    workflow.add_edge("fetcher", "deduplicator")
+    workflow.add_edge("deduplicator", "formatter")
+    workflow.add_edge("formatter", "json_creator")
+    workflow.add_edge("json_creator", END)
 
-#     # Initialize the state with input data
-#     initial_state = InterviewState(input={
-#         "company_name": company_name,
-#         "job_role": job_role,
-#         "job_description": job_description
-#     })
+    workflow.set_entry_point("fetcher")
+    return workflow.compile()
 
-#     # Execute the workflow
-#     app = workflow.compile()
-#     result = app.invoke(initial_state)
 
-#     # Access the final_json directly from the result dictionary
-#     #print("\nFinal Output JSON:\n", result['final_json'])
-    
-#     # Optionally, you can also pretty-print the JSON for better readability
-#     try:
-#         parsed_json = json.loads(result['final_json'])
-#         #print("\nPretty Printed JSON:")
-#         #print(json.dumps(parsed_json, indent=2))
-#     except json.JSONDecodeError:
-#         print("Could not parse the final_json as valid JSON")
-#     print(check_output_and_answer(parsed_json))
+_interview_graph = None
+
+
+def get_interview_graph():
+    """The compiled graph, built on first use; it is stateless between runs and safe to share."""
+    global _interview_graph
+    if _interview_graph is None:
+        _interview_graph = build_interview_graph()
+    return _interview_graph
+
+
+def warm_up() -> None:
+    """Import and build everything the interview path needs, so its first request doesn't."""
+    with span("warm_up"):
+        get_interview_graph()
+        import groq  # noqa: F401  the SDK behind llm.get_llm_client()
+        # Loads the TF-IDF index used to pick the company's DSA problems
+        get_repository().rank("software engineer", 1)
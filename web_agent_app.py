@@ -1,6 +1,63 @@
+import os
+import json
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import requests
-from typing import Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional
+
+API_URL = os.getenv("EZ_SEARCH_API_URL", "http://localhost:7070")
+# Seconds a response is reused for a repeated submission with the same inputs
+CLIENT_CACHE_TTL = int(os.getenv("CLIENT_CACHE_TTL", 600))
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One keep-alive connection pool shared by every rerun and user session."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="ez-search-api")
+
+@st.cache_data(ttl=CLIENT_CACHE_TTL, show_spinner=False)
+def post_json(path: str, payload: Dict) -> Dict:
+    """POST to the API through the shared session; failures raise and are not cached."""
+    response = get_session().post(f"{API_URL}{path}", json=payload)
+    response.raise_for_status()
+    return response.json()
+
+class EventCache:
+    """TTL'd store of completed interview-question streams, replayed for repeated submissions."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, tuple] = {}
+
+    def get(self, key: tuple) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            return entry[1]
+
+    def put(self, key: tuple, events: List[Dict]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[key] = (now + self.ttl, events)
+
+@st.cache_resource
+def get_event_cache() -> EventCache:
+    return EventCache(CLIENT_CACHE_TTL)
 
 def dict_values_to_list(d):
     """
@@ -15,16 +72,30 @@ def dict_values_to_list(d):
             return list(d.values())
     return d
 
-def generate_dsa_questions(company_name: str) -> Dict:
+def generate_dsa_questions(company_name: str, difficulty: Optional[List[str]] = None,
+                           limit: Optional[int] = None, offset: int = 0) -> Dict:
     """
     Call the API to generate DSA questions based on company name.
-    Sends company_name in request body.
+    Sends company_name plus the optional difficulty filter and page in request body.
+    """
+    try:
+        payload = {"company_name": company_name, "difficulty": difficulty or None,
+                   "limit": limit, "offset": offset}
+        return post_json("/generate_dsa_questions", payload)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching DSA questions: {str(e)}")
+        return {"error": str(e)}
+
+def generate_dsa_questions_bulk(company_names: List[str], difficulty: Optional[List[str]] = None,
+                                limit: Optional[int] = None) -> Dict:
+    """
+    Call the API once for several companies; the response holds the per-company
+    sets and an aggregated view of the questions most of them ask.
     """
     try:
-        payload = {"company_name": company_name}
-        response = requests.post("http://localhost:7070/generate_dsa_questions", json=payload)
-        response.raise_for_status()
-        return response.json()
+        payload = {"company_names": company_names, "difficulty": difficulty or None,
+                   "limit": limit, "aggregate_limit": limit}
+        return post_json("/generate_dsa_questions/bulk", payload)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching DSA questions: {str(e)}")
         return {"error": str(e)}
@@ -39,13 +110,73 @@ def generate_interview_questions(company_name: str, job_role: str, job_descripti
             "job_role": job_role,
             "job_description": job_description
         }
-        response = requests.post("http://localhost:7070/generate_interview_questions", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return post_json("/generate_interview_questions", payload)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching interview questions: {str(e)}")
         return {"error": str(e)}
 
+def stream_interview_questions(company_name: str, job_role: str, job_description: str,
+                               session: Optional[requests.Session] = None) -> Iterator[Dict]:
+    """
+    Call the streaming API and yield its events (scraped sources, then curated
+    questions) as they arrive.
+    """
+    payload = {
+        "company_name": company_name,
+        "job_role": job_role,
+        "job_description": job_description
+    }
+    try:
+        with (session or get_session()).post(f"{API_URL}/generate_interview_questions/stream",
+                                             json=payload, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+    except requests.exceptions.RequestException as e:
+        yield {"event": "error", "detail": str(e)}
+
+def start_interview_stream(company_name: str, job_role: str, job_description: str) -> Iterator[Dict]:
+    """
+    Start the streaming request in a background thread right away, so it runs
+    concurrently with whatever the page renders next, and return an iterator
+    over its events. A stream completed for the same inputs within the TTL is
+    replayed instead.
+    """
+    key = (company_name, job_role, job_description)
+    cache = get_event_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return iter(cached)
+
+    events: "queue.Queue[Optional[Dict]]" = queue.Queue()
+    # Resolved here: Streamlit caches shouldn't be called from the worker thread
+    session = get_session()
+
+    def run():
+        try:
+            for event in stream_interview_questions(company_name, job_role, job_description, session):
+                events.put(event)
+        except Exception as e:
+            events.put({"event": "error", "detail": str(e)})
+        finally:
+            events.put(None)
+
+    get_executor().submit(run)
+
+    def received() -> Iterator[Dict]:
+        collected = []
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            collected.append(event)
+            yield event
+        if not any(e.get("event") == "error" for e in collected):
+            cache.put(key, collected)
+
+    return received()
+
 def display_dsa_questions(data: Dict):
     """
     Display DSA questions in a formatted way, handling dicts with integer keys.
@@ -90,6 +221,30 @@ def display_dsa_questions(data: Dict):
             if link:
                 st.markdown(f"**Problem Link:** [Open]({link})")
 
+def display_dsa_questions_bulk(data: Dict):
+    """
+    Display the aggregated questions (with the companies asking them) followed
+    by each company's own set.
+    """
+    if "error" in data:
+        st.error(f"Could not retrieve data: {data['error']}")
+        return
+    if data.get("unknown"):
+        st.warning(f"No DSA questions found for: {', '.join(data['unknown'])}")
+
+    st.markdown("#### Asked by the most of these companies")
+    for i, q in enumerate(data.get("aggregated", []), 1):
+        companies = ", ".join(q.get("companies", []))
+        with st.expander(f"{i}. {q['question_name']} ({q['company_count']} of {len(data['companies'])}: {companies})"):
+            st.markdown(f"**Difficulty:** {q.get('difficulty', '')}  \n**Topics:** {', '.join(q.get('subtopics', []))}")
+            link = q.get("question_link", "").strip()
+            if link:
+                st.markdown(f"**Problem Link:** [Open]({link})")
+
+    for company, questions in data.get("companies", {}).items():
+        st.markdown(f"#### {company.title()} ({data['totals'][company]} questions)")
+        display_dsa_questions({company: questions})
+
 def display_interview_questions(data: Dict):
     """
     Display interview questions in a formatted way, handling dicts with integer keys.
@@ -124,6 +279,34 @@ def display_interview_questions(data: Dict):
                 if "link" in q and q["link"]:
                     st.markdown(f"**Reference:** [Learn more]({q['link']})")
 
+def display_interview_questions_stream(events: Iterator[Dict]):
+    """
+    Render streamed interview questions as they arrive: a running count of scraped
+    questions per source, then each curated question as soon as it is generated.
+    """
+    status = st.empty()
+    scraped = 0
+    sources = 0
+    curated = 0
+    for event in events:
+        kind = event.get("event")
+        if kind == "source":
+            sources += 1
+            scraped += len(event.get("questions", []))
+            status.info(f"Collected {scraped} candidate questions from {sources} source(s), curating...")
+        elif kind == "question":
+            curated += 1
+            q = event["question"]
+            with st.expander(f"{curated}. {q.get('question', '')}"):
+                if q.get("type"):
+                    st.markdown(f"**Type:** {q['type']}")
+                if q.get("link"):
+                    st.markdown(f"**Reference:** [Learn more]({q['link']})")
+        elif kind == "error":
+            st.error(f"Could not retrieve data: {event.get('detail')}")
+        elif kind == "done":
+            status.success(f"{curated} curated questions from {scraped} candidates.")
+
 def main():
     st.set_page_config(page_title="Interview Questions Generator", 
                        page_icon="💼", 
@@ -135,10 +318,15 @@ def main():
     with st.form("input_form"):
         col1, col2 = st.columns(2)
         with col1:
-            company_name = st.text_input("Company Name", placeholder="e.g., Google")
+            company_name = st.text_input("Company Name", placeholder="e.g., Google (or Google, Amazon for several)")
         with col2:
             job_role = st.text_input("Job Role", placeholder="e.g., Software Engineer")
         job_description = st.text_area("Job Description", height=150, placeholder="Paste the job description here...")
+        col3, col4 = st.columns(2)
+        with col3:
+            difficulty = st.multiselect("DSA Difficulty", ["Easy", "Medium", "Hard"])
+        with col4:
+            dsa_limit = st.number_input("DSA questions to show", min_value=1, max_value=500, value=25)
         submitted = st.form_submit_button("Generate Questions")
 
     if submitted:
@@ -146,15 +334,21 @@ def main():
             st.error("Please fill in all fields before submitting.")
         else:
             with st.spinner("Generating questions..."):
+                # Both API calls are in flight at once: the interview stream runs in the background
+                interview_events = start_interview_stream(company_name, job_role, job_description)
                 tab1, tab2 = st.tabs(["DSA Questions", "Interview Questions"])
                 with tab1:
                     st.subheader("Data Structures & Algorithms Questions")
-                    dsa_questions = generate_dsa_questions(company_name)
-                    display_dsa_questions(dsa_questions)
+                    companies = [c.strip() for c in company_name.split(",") if c.strip()]
+                    if len(companies) > 1:
+                        # One round trip for all target companies
+                        display_dsa_questions_bulk(generate_dsa_questions_bulk(companies, difficulty, int(dsa_limit)))
+                    else:
+                        dsa_questions = generate_dsa_questions(company_name, difficulty, int(dsa_limit))
+                        display_dsa_questions(dsa_questions)
                 with tab2:
                     st.subheader("Technical & Behavioral Questions")
-                    interview_questions = generate_interview_questions(company_name, job_role, job_description)
-                    display_interview_questions(interview_questions)
+                    display_interview_questions_stream(interview_events)
 
     st.markdown("---")
     with st.expander("How to use this tool"):